@@ -0,0 +1 @@
+"""Benchmark konverter rekening koran: python -m benchmarks.<nama>"""
@@ -0,0 +1,117 @@
+"""Bandingkan parse_line BCA: rantai if/elif script Colab vs satu regex dari table.
+
+Tipe Transaksi dan Keterangan hasil parse_line sekarang dicocokkan dengan
+parse_line lama (salinan di bawah), termasuk baris tanpa kode CBG dan baris
+dengan dua kode transaksi.
+
+    python -m benchmarks.bench_bca_types --lines 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from rekening_koran.formats.format_4 import TRANSACTION_TYPES, YEAR, parse_line
+
+
+def legacy_parse_line(line):
+    """parse_line lama di format_4.py (sebelum table TRANSACTION_TYPES), persis"""
+    parts = line.split()
+    date = parts[0]
+
+    # Find all numbers in the line
+    numbers = re.findall(r'([\d,]+\.\d{2})', line)
+
+    if 'TRSF E-BANKING CR' in line:
+        trans_type = 'Transfer E-Banking (Kredit)'
+    elif 'TRSF E-BANKING DB' in line:
+        trans_type = 'Transfer E-Banking (Debit)'
+    elif 'BI-FAST CR' in line:
+        trans_type = 'BI-FAST (Kredit)'
+    elif 'BI-FAST DB' in line:
+        trans_type = 'BI-FAST (Debit)'
+    elif 'SWITCHING CR' in line:
+        trans_type = 'Switching (Kredit)'
+    elif 'BIAYA ADM' in line:
+        trans_type = 'Biaya Admin'
+    elif 'BUNGA' in line:
+        trans_type = 'Bunga'
+    elif 'PAJAK BUNGA' in line:
+        trans_type = 'Pajak Bunga'
+    else:
+        trans_type = parts[1] if len(parts) > 1 else ''
+
+    desc = line
+    desc = re.sub(r'^\d{2}/\d{2}\s+', '', desc)
+    desc = re.sub(r'(TRSF E-BANKING CR|TRSF E-BANKING DB|BI-FAST CR|BI-FAST DB|SWITCHING CR|BIAYA ADM|BUNGA|PAJAK BUNGA)', '', desc)
+    desc = re.sub(r'\s+[\d,]+\.\d{2}.*$', '', desc)
+    desc = re.sub(r'^\s*\d+\s+', '', desc)  # Remove CBG code
+    desc = desc.strip()
+
+    is_debit = ' DB' in line
+
+    balance = numbers[-1] if numbers else ''
+    amount = numbers[-2] if len(numbers) >= 2 else ''
+
+    return [
+        date + '/' + YEAR,
+        trans_type,
+        desc,
+        amount if is_debit else '',
+        amount if not is_debit else '',
+        balance,
+    ]
+
+
+def synthetic_lines(n, seed=1, two_codes=0.2):
+    """
+    Baris transaksi BCA dengan semua kode di TRANSACTION_TYPES plus kode yang tidak dikenal
+    two_codes: bagian baris yang berisi kode kedua di berita transfer
+    Sebagian baris tanpa kode CBG dan nama (mis. BUNGA, BIAYA ADM), jadi keterangannya kosong
+    """
+    r = random.Random(seed)
+    kinds = [keyword for keyword, _, _ in TRANSACTION_TYPES] + ['KR OTOMATIS', 'TARIKAN ATM']
+    lines = []
+    for i in range(n):
+        kind = r.choice(kinds)
+        note = f" {r.choice(kinds)}" if r.random() < two_codes else ''
+        body = f" 0{r.randint(100, 999)} NAMA {r.randint(1, 99)}{note}" if r.random() < 0.7 else note
+        lines.append(f"{i % 28 + 1:02d}/12 {kind}{body} "
+                     f"{r.uniform(1000, 900000):,.2f} DB {r.uniform(1e6, 1e9):,.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--two-codes', type=float, default=0.2, metavar='FRAKSI',
+                        help='bagian baris dengan dua kode transaksi (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    lines = synthetic_lines(args.lines, two_codes=args.two_codes)
+    print(f"📊 {args.lines:,} lines, {len(TRANSACTION_TYPES)} kode\n")
+
+    start = time.perf_counter()
+    legacy = [legacy_parse_line(line)[1:3] for line in lines]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = [parse_line(line)[1:3] for line in lines]
+    table_seconds = time.perf_counter() - start
+
+    # Satu-satunya beda (Tipe Transaksi, Keterangan) yang diharapkan: PAJAK BUNGA dulu
+    # terbaca Bunga, keterangan tetap sama (juga di baris dengan dua kode atau tanpa CBG)
+    differences = [(old, new) for old, new in zip(legacy, table) if old != new]
+    pajak = sum(1 for old, new in differences if (old[0], new[0]) == ('Bunga', 'Pajak Bunga') and old[1] == new[1])
+
+    print(f"if/elif : {legacy_seconds:7.2f}s  {args.lines / legacy_seconds:12,.0f} lines/s")
+    print(f"regex   : {table_seconds:7.2f}s  {args.lines / table_seconds:12,.0f} lines/s")
+    print(f"speedup : {legacy_seconds / table_seconds:7.2f}x")
+    print(f"beda    : {len(differences):,} baris (PAJAK BUNGA: {pajak:,})")
+    if len(differences) != pajak:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Bandingkan parser baris BSI: versi script Colab vs tokenizer dari belakang.
+
+    python -m benchmarks.bench_bsi_parser --lines 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from rekening_koran.common import is_number
+from rekening_koran.formats.format_2 import is_header_line, parse_transaction_line
+
+
+def legacy_parse_transaction_line(line):
+    """parse_transaction_line persis seperti di format_2.py (Debit/Credit langsung)"""
+    line = line.strip()
+
+    date_pattern = r'^(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
+    date_match = re.match(date_pattern, line)
+
+    if not date_match:
+        return None
+
+    date = date_match.group(1)
+    rest = line[len(date):].strip()
+
+    parts = rest.split()
+
+    if len(parts) < 5:
+        return None
+
+    if 'IDR' not in [p.upper() for p in parts]:
+        return None
+
+    if 'DB' not in [p.upper() for p in parts] and 'CR' not in [p.upper() for p in parts]:
+        return None
+
+    balance = parts[-1]
+    if not is_number(balance):
+        return None
+
+    db_cr = parts[-2].upper()
+    if db_cr not in ['DB', 'CR']:
+        return None
+
+    amount = parts[-3]
+    if not is_number(amount):
+        return None
+
+    if parts[-4].upper() != 'IDR':
+        return None
+
+    ft_number = parts[0]
+
+    idr_position = len(parts) - 4
+    description = ' '.join(parts[1:idr_position])
+
+    if db_cr == 'DB':
+        return [date, ft_number, description, 'IDR', amount, '', balance]
+    return [date, ft_number, description, 'IDR', '', amount, balance]
+
+
+def legacy_parse_lines(lines):
+    """Loop halaman lama: lima cek skip sebelum parse setiap baris"""
+    page_data = []
+    for line in lines:
+        line = line.strip()
+
+        if not line:
+            continue
+        if 'Date' in line and 'FT Number' in line and 'Description' in line:
+            continue
+        if 'Account Statement' in line:
+            continue
+        if line.startswith('Page ') and '/' in line:
+            continue
+        if 'PT ASIA BARU BERKAH MAKASSAR' in line:
+            continue
+        if line.startswith('Date') and line.endswith('Balance'):
+            continue
+
+        parsed = legacy_parse_transaction_line(line)
+        if parsed:
+            page_data.append(parsed)
+    return page_data
+
+
+def parse_lines(lines):
+    """Loop halaman baru seperti format_2.parse_page"""
+    page_data = []
+    for line in lines:
+        parsed = parse_transaction_line(line)
+        if parsed and not is_header_line(line):
+            page_data.append(parsed)
+    return page_data
+
+
+def synthetic_lines(n, seed=1):
+    """Baris text BSI: sebagian besar transaksi, ditambah header, footer dan baris rusak"""
+    r = random.Random(seed)
+    words = ['TRANSFER', 'KE', 'DARI', 'BIAYA', 'ADM', 'QRIS', 'BSI', 'MOBILE', 'ZAKAT', 'Description']
+    odd = [
+        'Date FT Number Description Currency Amount DB/CR Balance',
+        'Account Statement',
+        'Page 3/12',
+        'PT ASIA BARU BERKAH MAKASSAR',
+        'Opening Balance : 10,000,000.00',
+        '',
+        '   ',
+        '2025-12-01 10:00:00 FT123 IDR 1,000.00 DB',
+        '2025-12-01 10:00:00 FT123 TRANSFER USD 1,000.00 DB 5,000.00',
+        '2025-12-01 10:00:00 FT123 TRANSFER IDR abc DB 5,000.00',
+        '2025-12-01 10:00:00 FT123 TRANSFER IDR 1,000.00 XX 5,000.00',
+        '2025-12-01 10:00:00 FT123 PT ASIA BARU BERKAH MAKASSAR IDR 1,000.00 CR 5,000.00',
+        '2025-12-01 10:00:00FT123 IDR 1,000.00 cr 5,000.00',
+        '2025-12-01\t10:00:00  FT123   TRANSFER\tKE  IDR   1,000.00 db   -5,000.00  ',
+        '2025-12-01 10:00:00 FT123 TRANSFER idr ²,000 DB 5,000.00',
+    ]
+    lines = []
+    balance = 10_000_000.0
+    for i in range(n):
+        if r.random() < 0.05:
+            lines.append(r.choice(odd))
+            continue
+        amount = round(r.uniform(1000, 900000), 2)
+        is_debit = r.random() < 0.5
+        balance += -amount if is_debit else amount
+        description = ' '.join(r.choice(words) for _ in range(r.randint(0, 6)))
+        lines.append(
+            f"2025-12-{i % 28 + 1:02d} 10:{i % 60:02d}:00 FT2534{i:08d} {description} "
+            f"IDR {amount:,.2f} {'DB' if is_debit else 'CR'} {balance:,.2f}"
+        )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    lines = synthetic_lines(args.lines)
+    print(f"📊 {args.lines:,} lines\n")
+
+    start = time.perf_counter()
+    legacy = legacy_parse_lines(lines)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = parse_lines(lines)
+    compiled_seconds = time.perf_counter() - start
+
+    print(f"legacy  : {legacy_seconds:7.2f}s  {args.lines / legacy_seconds:12,.0f} lines/s")
+    print(f"rsplit  : {compiled_seconds:7.2f}s  {args.lines / compiled_seconds:12,.0f} lines/s")
+    print(f"speedup : {legacy_seconds / compiled_seconds:7.2f}x")
+    print(f"rows    : {len(compiled):,}  identik: {'ya' if legacy == compiled else 'TIDAK'}")
+    if legacy != compiled:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Bandingkan konversi angka: Series.apply(convert_to_indonesian_format) vs convert_column.
+
+    python -m benchmarks.bench_numbers --values 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+
+from rekening_koran.numbers import convert_column
+
+
+def legacy_convert(value):
+    """convert_to_indonesian_format persis seperti di format_1.py / format_2.py"""
+    if pd.isna(value) or value == '':
+        return ''
+
+    value_str = str(value).strip()
+    value_str = re.sub(r'[^\d,.-]', '', value_str)
+
+    if not value_str or value_str == '-':
+        return ''
+
+    try:
+        if ',' in value_str and '.' in value_str:
+            value_str = value_str.replace(',', '')
+            number = float(value_str)
+        elif ',' in value_str:
+            if value_str.index(',') == len(value_str) - 3:
+                value_str = value_str.replace('.', '').replace(',', '.')
+                number = float(value_str)
+            else:
+                value_str = value_str.replace(',', '')
+                number = float(value_str)
+        else:
+            number = float(value_str)
+
+        formatted = f"{number:,.2f}"
+        formatted = formatted.replace(',', 'TEMP').replace('.', ',').replace('TEMP', '.')
+        return formatted
+
+    except (ValueError, AttributeError):
+        return value_str
+
+
+def synthetic_values(n, seed=1):
+    """Campuran nilai US (1,234.56), ID (1.234,56), tanpa desimal dan kosong"""
+    r = random.Random(seed)
+    values = []
+    for _ in range(n):
+        amount = r.uniform(0, 1e9)
+        kind = r.random()
+        if kind < 0.6:
+            values.append(f"{amount:,.2f}")
+        elif kind < 0.8:
+            values.append(f"{amount:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'))
+        elif kind < 0.9:
+            values.append(f"{int(amount):,}")
+        else:
+            values.append('')
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--values', type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    values = synthetic_values(args.values)
+    series = pd.Series(values)
+    print(f"📊 {args.values:,} values\n")
+
+    start = time.perf_counter()
+    legacy = series.apply(legacy_convert).tolist()
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized, _ = convert_column(values)
+    vectorized_seconds = time.perf_counter() - start
+
+    print(f"apply   : {legacy_seconds:7.2f}s  {args.values / legacy_seconds:12,.0f} values/s")
+    print(f"column  : {vectorized_seconds:7.2f}s  {args.values / vectorized_seconds:12,.0f} values/s")
+    print(f"speedup : {legacy_seconds / vectorized_seconds:7.2f}x")
+    # Nilai 1.234,56 memang berbeda: versi lama membacanya sebagai 1,23
+    differ = sum(1 for a, b in zip(legacy, vectorized) if a != b)
+    id_values = sum(1 for v in values if ',' in v and '.' in v and v.rindex(',') > v.rindex('.'))
+    print(f"beda    : {differ:,} (nilai format ID dengan titik ribuan: {id_values:,})")
+
+
+if __name__ == '__main__':
+    main()
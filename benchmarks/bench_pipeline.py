@@ -0,0 +1,165 @@
+"""Ukur setiap tahap konversi untuk keempat layout pada PDF sintetis.
+
+    python -m benchmarks.bench_pipeline --pages 10,100,1000
+    python -m benchmarks.bench_pipeline --json hasil.json --compare baseline.json
+
+Tahap (waktu dijumlah per halaman):
+
+- open   : buka PDF dan objek halaman
+- text   : interpretasi content stream (pdfminer) dan layout kata (PageView)
+- parse  : read_info + parse_page
+- clean  : buang baris kosong dan duplikat
+- format : finalize_rows (angka dan text)
+- xlsx   : tulis XlsxSink sampai file tersimpan
+
+Setiap kasus dijalankan di proses baru (spawn) supaya peak RSS tidak
+tercampur antar kasus.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rekening_koran.formats import get_parser
+from rekening_koran.page import Document
+from rekening_koran.sinks import XlsxSink
+from rekening_koran.stream import clean_rows
+
+from .synthetic import LAYOUTS, write_statement
+
+STAGES = ['open', 'text', 'parse', 'clean', 'format', 'xlsx']
+
+
+def run_case(pdf_path, format_name, xlsx_path):
+    """Konversi satu PDF tahap demi tahap; return dict waktu per tahap, rows, peak RSS"""
+    parser = get_parser(format_name)
+    seconds = dict.fromkeys(STAGES, 0.0)
+    clock = time.perf_counter
+
+    start = clock()
+    doc = Document(pdf_path)
+    n_pages = len(doc)
+    seconds['open'] += clock() - start
+
+    start = clock()
+    sink = XlsxSink(xlsx_path, parser)
+    seconds['xlsx'] += clock() - start
+
+    info, state = {}, {}
+    seen = set() if parser.DEDUPLICATE else None
+    total_rows = 0
+    for index in range(n_pages):
+        start = clock()
+        page = doc.page(index)
+        page.page_obj
+        seconds['open'] += clock() - start
+
+        start = clock()
+        page.text
+        seconds['text'] += clock() - start
+
+        start = clock()
+        if index == 0:
+            info.update(parser.read_info(page, state))
+        rows = parser.parse_page(page, state)
+        seconds['parse'] += clock() - start
+
+        start = clock()
+        rows = clean_rows(rows, seen)
+        seconds['clean'] += clock() - start
+
+        start = clock()
+        records = parser.finalize_rows(rows, info)
+        seconds['format'] += clock() - start
+
+        start = clock()
+        sink.write_rows(records)
+        seconds['xlsx'] += clock() - start
+
+        total_rows += len(records)
+        doc.release(index)
+
+    start = clock()
+    parser.finish_info(info, total_rows)
+    sink.close(parser.info_rows(info, total_rows))
+    seconds['xlsx'] += clock() - start
+    doc.close()
+
+    return {
+        'format': format_name,
+        'pages': n_pages,
+        'rows': total_rows,
+        'seconds': seconds,
+        # ru_maxrss dalam KiB di Linux
+        'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def statement_path(data_dir, format_name, n_pages):
+    """PDF sintetis di data_dir, dibuat sekali lalu dipakai ulang"""
+    path = os.path.join(data_dir, f"{format_name}-{n_pages}.pdf")
+    if not os.path.exists(path):
+        write_statement(path, format_name, n_pages)
+    return path
+
+
+def print_result(result, baseline=None):
+    total = sum(result['seconds'].values())
+    stages = '  '.join(f"{result['seconds'][stage]:7.2f}" for stage in STAGES)
+    line = (f"{result['format']:9s} {result['pages']:5d}  {stages}  {total:7.2f}  "
+            f"{result['pages'] / total:8.1f}  {result['rows'] / total:9,.0f}  {result['peak_rss_mib']:7.1f}")
+    if baseline:
+        line += f"  {sum(baseline['seconds'].values()) / total:6.2f}x"
+    print(line)
+
+
+def int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int_list, default=[10, 100, 1000], help='jumlah halaman, dipisah koma')
+    parser.add_argument('--formats', default=','.join(LAYOUTS), help='layout, dipisah koma')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'rekening_koran_bench'),
+                        help='folder PDF sintetis (dibuat sekali)')
+    parser.add_argument('--json', metavar='PATH', help='simpan hasil untuk dibandingkan nanti')
+    parser.add_argument('--compare', metavar='PATH', help='hasil --json sebelumnya; tampilkan speedup')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(r['format'], r['pages']): r for r in json.load(f)}
+
+    header = '  '.join(f"{stage:>7s}" for stage in STAGES)
+    print(f"📊 detik per tahap, pages/s dan rows/s dari total, peak RSS per proses\n")
+    print(f"{'format':9s} {'pages':>5s}  {header}  {'total':>7s}  {'pages/s':>8s}  {'rows/s':>9s}  {'RSS MiB':>7s}"
+          + ('  speedup' if baseline else ''))
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        for format_name in args.formats.split(','):
+            for n_pages in args.pages:
+                pdf_path = statement_path(args.data_dir, format_name, n_pages)
+                xlsx_path = os.path.join(tmp, f"{format_name}-{n_pages}.xlsx")
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(run_case, pdf_path, format_name, xlsx_path).result()
+                results.append(result)
+                print_result(result, baseline.get((format_name, n_pages)))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 {args.json}")
+
+
+if __name__ == '__main__':
+    main()
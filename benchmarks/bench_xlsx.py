@@ -0,0 +1,100 @@
+"""Bandingkan penulisan XLSX: pd.ExcelWriter + to_excel vs XlsxSink write-only.
+
+    python -m benchmarks.bench_xlsx --rows 200000
+"""
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from rekening_koran.formats import format_4
+from rekening_koran.sinks import XlsxSink
+
+BATCH_SIZE = 50
+
+
+def synthetic_rows(n, seed=1):
+    """Baris mentah format BCA (Debit/Kredit/Saldo masih float)"""
+    r = random.Random(seed)
+    saldo = 645447905.64
+    rows = []
+    for i in range(n):
+        amount = round(r.uniform(1000, 5000000), 2)
+        is_debit = r.random() < 0.5
+        saldo += -amount if is_debit else amount
+        rows.append([
+            f"{i % 28 + 1:02d}/12/2025",
+            'Transfer E-Banking (Debit)' if is_debit else 'Transfer E-Banking (Kredit)',
+            f"{r.randint(1000, 9999)}/FTSCY/WS95051 NAMA PENERIMA {i}",
+            amount if is_debit else 0,
+            0 if is_debit else amount,
+            saldo,
+        ])
+    return rows
+
+
+def write_pandas(rows, path):
+    """Alur lama format_4.py: DataFrame, to_excel, lalu lebar kolom dari semua sel"""
+    info = {}
+    records = format_4.finalize_rows(rows, info)
+    format_4.finish_info(info, len(records))
+    df = pd.DataFrame(records, columns=format_4.OUTPUT_COLUMNS)
+    summary = pd.DataFrame(format_4.info_rows(info, len(df)), columns=format_4.INFO_HEADER)
+
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        summary.to_excel(writer, sheet_name=format_4.INFO_SHEET, index=False)
+        df.to_excel(writer, sheet_name=format_4.DATA_SHEET, index=False)
+        for worksheet in writer.sheets.values():
+            for column in worksheet.columns:
+                max_length = max(len(str(cell.value)) for cell in column if cell.value is not None)
+                worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+
+
+def write_stream(rows, path):
+    """Alur baru: batch per halaman ke XlsxSink"""
+    info = {}
+    sink = XlsxSink(path, format_4)
+    for start in range(0, len(rows), BATCH_SIZE):
+        sink.write_rows(format_4.finalize_rows(rows[start:start + BATCH_SIZE], info))
+    format_4.finish_info(info, len(rows))
+    sink.close(format_4.info_rows(info, len(rows)))
+
+
+def measure(name, n, path):
+    """Jalankan satu varian di proses baru supaya peak RSS tidak tercampur"""
+    rows = synthetic_rows(n)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    WRITERS[name](rows, path)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam KiB di Linux
+    return elapsed, (rss_after - rss_before) * 1024
+
+
+WRITERS = {'pandas': write_pandas, 'stream': write_stream}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    print(f"📊 {args.rows:,} rows (peak = kenaikan RSS di atas baris input)\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in WRITERS:
+            path = os.path.join(tmp, name + '.xlsx')
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                elapsed, peak = pool.submit(measure, name, args.rows, path).result()
+            print(f"{name:8s}: {elapsed:8.2f}s  {args.rows / elapsed:10,.0f} rows/s  "
+                  f"peak {peak / 2**20:8.1f} MiB  file {os.path.getsize(path) / 2**20:6.1f} MiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""PDF rekening koran sintetis untuk keempat layout, tanpa dependency.
+
+PDF ditulis langsung (Helvetica, satu content stream per halaman), jadi
+ribuan halaman selesai dalam hitungan detik dan isinya selalu sama untuk
+seed yang sama.
+
+    python -m benchmarks.synthetic format_3 bri-100.pdf --pages 100
+"""
+
+import argparse
+import random
+
+# Ukuran halaman landscape A4 (pt)
+PAGE_SIZE = (842, 595)
+ROWS_PER_PAGE = 30
+LINE_HEIGHT = 12
+
+
+def escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, pages, size=PAGE_SIZE, font_size=7):
+    """
+    Tulis PDF dari list halaman (texts, lines)
+    texts: [(x, y, text)], lines: [(x0, y0, x1, y1)] garis tabel
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for texts, lines in pages:
+        ops = [f"{x0} {y0} m {x1} {y1} l S" for x0, y0, x1, y1 in lines]
+        ops += [f"BT /F1 {font_size} Tf {x} {y} Td ({escape(text)}) Tj ET" for x, y, text in texts]
+        stream = '\n'.join(ops).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {size[0]} {size[1]}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>".encode()
+        )
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b''.join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def amount_text(value):
+    return f"{value:,.2f}"
+
+
+def format_1_pages(n_pages, r, rows_per_page=25):
+    """Tabel 9 kolom bergaris: No, Tgl dan Waktu, ..., Debit, Kredit, Saldo"""
+    columns = [30, 60, 150, 240, 460, 500, 540, 620, 700, 800]
+    row_height = 14
+    saldo = 1_000_000.0
+    number = 0
+    pages = []
+    for p in range(n_pages):
+        texts, lines = [], []
+        y = 560
+        if p == 0:
+            for text in ["Periode : 01/12/2025 - 31/12/2025", "Nama Tercetak : BUDI", "Nomor Rekening : 1234567890"]:
+                texts.append((30, y, text))
+                y -= LINE_HEIGHT
+        top = y + 9
+        rows = [["No.", "Tgl dan Waktu", "No Referensi", "Deskripsi", "Kode", "D/K", "Debit", "Kredit", "Saldo"]]
+        for i in range(rows_per_page):
+            number += 1
+            amount = round(r.uniform(1000, 900000), 2)
+            is_debit = r.random() < 0.5
+            saldo += -amount if is_debit else amount
+            rows.append([
+                str(number), f"{i % 28 + 1:02d}/12/25 10:{i % 60:02d}", f"REF{number:06d}",
+                f"TRANSFER {r.randint(1, 99)}", "TRF", "D" if is_debit else "K",
+                amount_text(amount) if is_debit else "0.00", "0.00" if is_debit else amount_text(amount),
+                amount_text(saldo),
+            ])
+        for row in rows:
+            texts.extend((x + 2, y, text) for x, text in zip(columns, row))
+            y -= row_height
+        bottom = y + 9
+        lines.extend((x, top, x, bottom) for x in columns)
+        lines.extend((columns[0], top - k * row_height, columns[-1], top - k * row_height) for k in range(len(rows) + 1))
+        pages.append((texts, lines))
+    return pages
+
+
+def format_2_pages(n_pages, r, rows_per_page=ROWS_PER_PAGE):
+    """BSI: baris 'YYYY-MM-DD HH:MM:SS FT... deskripsi IDR jumlah DB/CR saldo'"""
+    saldo = 10_000_000.0
+    pages = []
+    for p in range(n_pages):
+        texts = []
+        y = 560
+        if p == 0:
+            for text in ["Account Statement", "Account : 7123456789", "Date : 01/12/2025 - 31/12/2025",
+                         "Opening Balance : 10,000,000.00", "Branch : KC MAKASSAR"]:
+                texts.append((40, y, text))
+                y -= LINE_HEIGHT
+        texts.append((40, y, "Date FT Number Description Currency Amount DB/CR Balance"))
+        y -= LINE_HEIGHT
+        for i in range(rows_per_page):
+            amount = round(r.uniform(1000, 900000), 2)
+            is_debit = r.random() < 0.5
+            saldo += -amount if is_debit else amount
+            texts.extend((x, y, text) for x, text in [
+                (40, f"2025-12-{i % 28 + 1:02d} 10:{i % 60:02d}:00"), (140, f"FT2534{p:03d}{i:04d}"),
+                (220, f"TRANSFER KE ACC {r.randint(1000, 9999)} BIAYA"), (520, "IDR"), (560, amount_text(amount)),
+                (640, "DB" if is_debit else "CR"), (680, amount_text(saldo)),
+            ])
+            y -= LINE_HEIGHT
+        texts.append((40, 20, f"Page {p + 1}/{n_pages}"))
+        pages.append((texts, []))
+    return pages
+
+
+def format_3_pages(n_pages, r, rows_per_page=ROWS_PER_PAGE):
+    """BRI: tabel tanpa garis Tanggal Transaksi, Uraian, Teller, Debet, Kredit, Saldo"""
+    columns = [40, 130, 360, 440, 540, 640]
+    saldo = 5_000_000.0
+    pages = []
+    for p in range(n_pages):
+        texts = []
+        y = 560
+        if p == 0:
+            for text in ["Kepada Yth.", "PT CONTOH", "No. Rekening : 012345678901",
+                         "Periode Transaksi : 01/12/25 - 31/12/25", "Nama Produk : BRITAMA"]:
+                texts.append((40, y, text))
+                y -= LINE_HEIGHT
+        texts.extend(zip(columns, [y] * 6, ["Tanggal Transaksi", "Uraian Transaksi", "Teller", "Debet", "Kredit", "Saldo"]))
+        y -= 14
+        for i in range(rows_per_page):
+            amount = round(r.uniform(1000, 900000), 2)
+            is_debit = r.random() < 0.5
+            saldo += -amount if is_debit else amount
+            values = [
+                f"{i % 28 + 1:02d}/12/25 10:11:{i % 60:02d}", f"TRF DARI {r.randint(10, 99)} KE", "ESBNN",
+                amount_text(amount) if is_debit else "0.00", "0.00" if is_debit else amount_text(amount),
+                amount_text(saldo),
+            ]
+            texts.extend((x, y, text) for x, text in zip(columns, values))
+            y -= LINE_HEIGHT
+        pages.append((texts, []))
+    return pages
+
+
+def format_4_pages(n_pages, r, rows_per_page=ROWS_PER_PAGE):
+    """BCA: baris 'DD/MM jenis CBG keterangan mutasi [DB] saldo'"""
+    kinds = ['TRSF E-BANKING CR', 'TRSF E-BANKING DB', 'BI-FAST CR', 'BI-FAST DB', 'BIAYA ADM', 'PAJAK BUNGA', 'BUNGA']
+    saldo = 645447905.64
+    pages = []
+    for p in range(n_pages):
+        texts = [(40, 560, "TANGGAL KETERANGAN CBG MUTASI SALDO")]
+        y = 560 - LINE_HEIGHT
+        if p == 0:
+            texts.append((40, y, f"01/12 SALDO AWAL {amount_text(saldo)}"))
+            y -= LINE_HEIGHT
+        for i in range(rows_per_page):
+            kind = r.choice(kinds)
+            amount = round(r.uniform(1000, 900000), 2)
+            is_debit = kind.endswith(' DB') or kind in ('BIAYA ADM', 'PAJAK BUNGA')
+            saldo += -amount if is_debit else amount
+            texts.extend((x, y, text) for x, text in [
+                (40, f"{i % 28 + 1:02d}/12"), (80, kind), (200, f"0{r.randint(100, 999)}"),
+                (240, f"NAMA {r.randint(1, 99)}"), (420, amount_text(amount) + (" DB" if is_debit else "")),
+                (520, amount_text(saldo)),
+            ])
+            y -= LINE_HEIGHT
+        pages.append((texts, []))
+    return pages
+
+
+LAYOUTS = {
+    'format_1': format_1_pages,
+    'format_2': format_2_pages,
+    'format_3': format_3_pages,
+    'format_4': format_4_pages,
+}
+
+
+def write_statement(path, format_name, n_pages, seed=1):
+    """Tulis rekening koran sintetis format_name dengan n_pages halaman"""
+    write_pdf(path, LAYOUTS[format_name](n_pages, random.Random(seed)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('format', choices=sorted(LAYOUTS))
+    parser.add_argument('path')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    write_statement(args.path, args.format, args.pages, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+"""Konversi PDF rekening koran ke Excel/CSV tanpa Google Colab.
+
+Logika parsing diambil dari script format_1.py sampai format_4.py.
+"""
+
+from .batch import convert_directory
+from .cache import RowCache
+from .convert import convert_file
+from .detect import detect_format
+from .formats import PARSERS, get_parser
+from .sinks import SINKS
+from .stream import iter_transactions, read_statement, write_statement
+from .watch import watch_directory
+
+__all__ = [
+    'PARSERS', 'RowCache', 'SINKS', 'convert_directory', 'convert_file', 'detect_format', 'get_parser',
+    'iter_transactions', 'read_statement', 'watch_directory', 'write_statement',
+]
@@ -0,0 +1,112 @@
+"""Konversi satu folder PDF sekaligus dengan process pool."""
+
+import csv
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .cache import DEFAULT_MAX_BYTES
+from .convert import convert_file
+from .sinks import DEFAULT_OUTPUTS
+
+SUMMARY_FIELDS = [
+    'file', 'format', 'confidence', 'status', 'pages', 'rows', 'seconds', 'outputs', 'cache', 'page_paths', 'check',
+    'error', 'archived',
+]
+
+
+def ignore_sigint():
+    """Initializer pool: Ctrl+C hanya ditangani proses utama, worker menyelesaikan file yang sedang jalan"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def find_pdfs(input_dir, recursive=False):
+    """Daftar file PDF di dalam folder, urut berdasarkan nama"""
+    pdf_files = []
+    for root, dirs, names in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name.lower().endswith('.pdf'):
+                pdf_files.append(os.path.join(root, name))
+        if not recursive:
+            break
+    return pdf_files
+
+
+def output_stem(pdf_path, input_dir):
+    """Nama file output: path relatif terhadap input_dir tanpa ekstensi, sub-folder dipisah '__'"""
+    return os.path.splitext(os.path.relpath(pdf_path, input_dir))[0].replace(os.sep, '__')
+
+
+def output_stems(pdf_files, input_dir):
+    """
+    (stem per PDF, {PDF: PDF lain yang stem-nya sama}); stem dibandingkan
+    tanpa beda huruf besar/kecil, jadi aman di file system case-insensitive
+    """
+    stems = {pdf_path: output_stem(pdf_path, input_dir) for pdf_path in pdf_files}
+    owners = {}
+    clashes = {}
+    for pdf_path, stem in stems.items():
+        owner = owners.setdefault(stem.lower(), pdf_path)
+        if owner != pdf_path:
+            clashes[pdf_path] = owner
+    return stems, clashes
+
+
+def convert_directory(input_dir, format_name, output_dir, workers=None, recursive=False, on_result=None,
+                      page_workers=None, outputs=DEFAULT_OUTPUTS, cache_dir=None,
+                      cache_bytes=DEFAULT_MAX_BYTES, metrics=False, profile=None):
+    """
+    Konversi semua PDF di input_dir, dibagi ke beberapa proses
+    Nama output mengikuti path relatif PDF (lihat output_stem), jadi a/statement.pdf
+    dan b/statement.pdf tidak saling menimpa; PDF yang nama output-nya tetap
+    bentrok dengan PDF sebelumnya dicatat gagal tanpa dikonversi
+    metrics/profile: lihat convert_file; hasilnya di result['metrics']
+    Return: list dict hasil per file, urut sesuai daftar file
+    """
+    pdf_files = find_pdfs(input_dir, recursive)
+    os.makedirs(output_dir, exist_ok=True)
+    stems, clashes = output_stems(pdf_files, input_dir)
+    results = {}
+
+    for pdf_path, owner in clashes.items():
+        results[pdf_path] = {'file': pdf_path, 'format': format_name, 'status': 'error',
+                             'error': f"Nama output {stems[pdf_path]} sudah dipakai {owner}"}
+        if on_result:
+            on_result(results[pdf_path])
+    todo = [pdf_path for pdf_path in pdf_files if pdf_path not in clashes]
+
+    if workers == 1:
+        for pdf_path in todo:
+            results[pdf_path] = convert_file(pdf_path, format_name, output_dir, page_workers, outputs,
+                                             cache_dir, cache_bytes, metrics, profile, stem=stems[pdf_path])
+            if on_result:
+                on_result(results[pdf_path])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(convert_file, pdf_path, format_name, output_dir, page_workers, outputs,
+                            cache_dir, cache_bytes, metrics, profile, stem=stems[pdf_path]): pdf_path
+                for pdf_path in todo
+            }
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker mati (mis. kehabisan memori), catat sebagai gagal
+                    result = {'file': pdf_path, 'format': format_name, 'status': 'error',
+                              'error': f"{type(e).__name__}: {e}"}
+                results[pdf_path] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[pdf_path] for pdf_path in pdf_files]
+
+
+def write_summary(results, summary_path):
+    """Simpan ringkasan hasil konversi ke CSV"""
+    with open(summary_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, restval='', extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
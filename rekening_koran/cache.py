@@ -0,0 +1,317 @@
+"""Cache baris mentah hasil parsing di SQLite, berdasarkan isi PDF.
+
+Dua tingkat kunci:
+
+- halaman: hash content stream + resources (font dsb.) halaman, ditambah
+  nama/VERSION parser dan state parser sebelum halaman itu. Rekening koran
+  month-to-date yang diterbitkan ulang lebih panjang hanya mem-parse
+  halaman yang baru; halaman lama diambil dari cache.
+- statement: hash SHA-256 isi file + nama parser + VERSION parser, berisi
+  info rekening dan daftar kunci halaman. File yang sama persis (walau
+  nama atau foldernya beda) tidak perlu dibuka lagi dengan pdfplumber.
+
+Yang disimpan adalah baris mentah per halaman (sebelum buang duplikat dan
+finalize_rows), sehingga semua jenis output tetap bisa dibuat dari cache.
+Ukuran cache dibatasi max_bytes; halaman yang paling lama tidak dipakai
+dibuang duluan (LRU), statement yang kehilangan halaman ikut dibuang.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import PSKeyword, PSLiteral
+
+from .extract import iter_keyed_page_rows
+from .formats import PARSERS
+
+CACHE_FILE = 'rows.sqlite'
+
+# Batas default ukuran baris yang disimpan (bukan ukuran file SQLite persis)
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    rows TEXT NOT NULL,
+    state TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used);
+CREATE TABLE IF NOT EXISTS statements (
+    key TEXT PRIMARY KEY,
+    file_hash TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    info TEXT NOT NULL,
+    pages INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS statements_file_hash ON statements (file_hash);
+CREATE TABLE IF NOT EXISTS statement_pages (
+    key TEXT NOT NULL,
+    page_num INTEGER NOT NULL,
+    page_key TEXT NOT NULL,
+    PRIMARY KEY (key, page_num)
+);
+CREATE INDEX IF NOT EXISTS statement_pages_page_key ON statement_pages (page_key);
+"""
+
+
+def file_hash(path, chunk_size=2**20):
+    """SHA-256 isi file, dibaca per potongan"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(digest, parser):
+    """Kunci cache statement: hash file + nama parser + versi parser"""
+    return f"{digest}:{parser.NAME}:{parser.VERSION}"
+
+
+def _hash_object(obj, digest, memo):
+    """
+    Masukkan objek PDF (dict, list, stream, referensi) ke digest secara rekursif
+    memo: hash objek tidak langsung per objid, supaya font yang dipakai banyak
+    halaman cukup di-hash sekali per dokumen
+    """
+    if isinstance(obj, PDFObjRef):
+        if obj.objid not in memo:
+            # Tandai dulu supaya referensi melingkar tidak berulang tanpa akhir
+            memo[obj.objid] = b'@%d' % obj.objid
+            sub = hashlib.blake2b(digest_size=16)
+            _hash_object(resolve1(obj), sub, memo)
+            memo[obj.objid] = sub.digest()
+        digest.update(b'R' + memo[obj.objid])
+    elif isinstance(obj, dict):
+        digest.update(b'{')
+        for key in sorted(obj):
+            digest.update(str(key).encode('utf-8', 'replace') + b':')
+            _hash_object(obj[key], digest, memo)
+        digest.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b'[')
+        for item in obj:
+            _hash_object(item, digest, memo)
+        digest.update(b']')
+    elif isinstance(obj, PDFStream):
+        _hash_object(obj.attrs, digest, memo)
+        data = obj.get_data()
+        digest.update(b'S%d:' % len(data) + data)
+    elif isinstance(obj, bytes):
+        digest.update(b'B%d:' % len(obj) + obj)
+    elif isinstance(obj, PSLiteral):
+        digest.update(b'/' + str(obj.name).encode('utf-8', 'replace'))
+    elif isinstance(obj, PSKeyword):
+        digest.update(b'K' + bytes(obj.name))
+    else:
+        digest.update(repr(obj).encode('utf-8'))
+    digest.update(b',')
+
+
+def page_hash(page, memo):
+    """Hash isi satu halaman: ukuran, rotasi, content stream dan resources"""
+    page_obj = page.page_obj
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((page_obj.mediabox, page_obj.cropbox, page_obj.rotate)).encode())
+    for stream in page_obj.contents:
+        _hash_object(stream, digest, memo)
+    _hash_object(page_obj.resources, digest, memo)
+    return digest.hexdigest()
+
+
+class RowCache:
+    """
+    Cache baris mentah per halaman dan per statement di satu file SQLite
+    Aman dipakai beberapa proses sekaligus (mode WAL, tunggu lock)
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, CACHE_FILE)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.page_hits = 0
+        self.page_misses = 0
+        self.digests = {}
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def file_hash(self, pdf_path):
+        """file_hash() yang diingat per path, supaya file hanya dibaca sekali"""
+        if pdf_path not in self.digests:
+            self.digests[pdf_path] = file_hash(pdf_path)
+        return self.digests[pdf_path]
+
+    def cached_format(self, pdf_path):
+        """Nama format dari cache jika file ini pernah dikonversi dengan versi parser sekarang"""
+        names = [
+            name for name, version in self.db.execute(
+                'SELECT parser, version FROM statements WHERE file_hash = ?', (self.file_hash(pdf_path),)
+            )
+            if name in PARSERS and PARSERS[name].VERSION == version
+        ]
+        # Lebih dari satu format (mis. dipaksa --format) berarti tidak pasti
+        return names[0] if len(names) == 1 else None
+
+    # ============================================================
+    # CACHE PER HALAMAN
+    # ============================================================
+    def parse_page(self, page, parser, state, memo):
+        """
+        parser.parse_page(page, state) lewat cache
+        Kunci ikut memuat state sebelum halaman dan state sesudahnya disimpan,
+        jadi parser yang membawa state antar halaman tetap benar
+        memo: dict per dokumen untuk page_hash()
+        Return: (page_key, rows)
+        """
+        state_before = json.dumps(state, sort_keys=True)
+        key = hashlib.blake2b(
+            f"{parser.NAME}:{parser.VERSION}:{page_hash(page, memo)}:{state_before}".encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        row = self.db.execute('SELECT rows, state FROM pages WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            self.page_hits += 1
+            self.db.execute('UPDATE pages SET last_used = ? WHERE key = ?', (time.time(), key))
+            state.clear()
+            state.update(json.loads(row[1]))
+            return key, json.loads(row[0])
+
+        self.page_misses += 1
+        # page_hash cukup dengan page_obj; layout pdfminer hanya untuk halaman yang belum ada
+        page.load_objects()
+        rows = parser.parse_page(page, state)
+        encoded = json.dumps(rows)
+        # Halaman langsung disimpan: kuncinya dari isi, jadi tetap berguna
+        # walaupun statement-nya nanti gagal
+        self.db.execute(
+            'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)',
+            (key, encoded, json.dumps(state, sort_keys=True), len(encoded), time.time()),
+        )
+        return key, rows
+
+    # ============================================================
+    # CACHE PER STATEMENT
+    # ============================================================
+    def iter_page_rows(self, pdf_path, parser, info, page_workers=None):
+        """
+        Generator (nomor_halaman, baris_mentah) seperti extract.iter_keyed_page_rows,
+        tapi baca dari cache jika ada
+        File yang sama persis tidak dibuka sama sekali dan halamannya dibaca satu
+        per satu dari database; file lain hanya mem-parse halaman yang belum ada
+        di cache. Statement baru tercatat setelah semua halaman selesai tanpa error
+        """
+        digest = self.file_hash(pdf_path)
+        key = cache_key(digest, parser)
+
+        # Transaksi baca: semua halaman dari satu snapshot, walaupun di-yield satu per satu
+        # (evict() di proses lain tidak bisa membuang halaman di tengah jalan)
+        self.db.execute('BEGIN')
+        try:
+            cached = self.load_statement(key)
+            if cached is not None:
+                self.hits += 1
+                info.update(cached[0])
+                for page_num, rows in cached[1]:
+                    yield page_num, json.loads(rows)
+        finally:
+            self.db.execute('COMMIT')
+        if cached is not None:
+            self.db.execute(
+                'UPDATE pages SET last_used = ? WHERE key IN (SELECT page_key FROM statement_pages WHERE key = ?)',
+                (time.time(), key),
+            )
+            return
+
+        self.misses += 1
+        page_keys = []
+        saved_info = None
+        for page_num, page_key, rows in iter_keyed_page_rows(pdf_path, parser, info, page_workers, self):
+            if saved_info is None:
+                # Salin sebelum finalize_rows menambah total ke info
+                saved_info = json.dumps(info)
+            page_keys.append((key, page_num, page_key))
+            yield page_num, rows
+
+        self.store_statement(key, digest, parser, saved_info or json.dumps(info), page_keys)
+
+    def load_statement(self, key):
+        """
+        (info, cursor (page_num, rows_json) urut halaman) atau None jika statement
+        atau halamannya tidak lengkap
+        Halaman tidak dimuat sekaligus; panggil di dalam transaksi baca supaya
+        cursor dan pengecekan jumlah halaman melihat isi database yang sama
+        """
+        row = self.db.execute('SELECT info, pages FROM statements WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        found = self.db.execute(
+            'SELECT COUNT(*) FROM statement_pages sp JOIN pages p ON p.key = sp.page_key WHERE sp.key = ?', (key,)
+        ).fetchone()[0]
+        if found != row[1]:
+            return None
+
+        pages = self.db.execute(
+            'SELECT sp.page_num, p.rows FROM statement_pages sp JOIN pages p ON p.key = sp.page_key '
+            'WHERE sp.key = ? ORDER BY sp.page_num', (key,)
+        )
+        return json.loads(row[0]), pages
+
+    def store_statement(self, key, digest, parser, info, page_keys):
+        """Catat statement beserta kunci halamannya, lalu jalankan evict()"""
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            self.db.execute('DELETE FROM statement_pages WHERE key = ?', (key,))
+            self.db.executemany('INSERT INTO statement_pages VALUES (?, ?, ?)', page_keys)
+            self.db.execute(
+                'INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?, ?, ?)',
+                (key, digest, parser.NAME, parser.VERSION, info, len(page_keys)),
+            )
+            self.evict()
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def evict(self):
+        """Hapus halaman yang paling lama tidak dipakai sampai total <= max_bytes"""
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in self.db.execute('SELECT key, size FROM pages ORDER BY last_used'):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self.db.executemany('DELETE FROM pages WHERE key = ?', victims)
+
+        # Statement yang halamannya ada yang terbuang sudah tidak berguna
+        orphans = self.db.execute(
+            'SELECT DISTINCT sp.key FROM statement_pages sp LEFT JOIN pages p ON p.key = sp.page_key '
+            'WHERE p.key IS NULL'
+        ).fetchall()
+        self.db.executemany('DELETE FROM statement_pages WHERE key = ?', orphans)
+        self.db.executemany('DELETE FROM statements WHERE key = ?', orphans)
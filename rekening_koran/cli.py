@@ -0,0 +1,255 @@
+"""Entry point command line: python -m rekening_koran convert DIR --workers N
+
+    python -m rekening_koran watch INBOX -o OUTPUT   # konversi PDF yang baru masuk
+    python -m rekening_koran serve --port 8080       # HTTP API dengan job queue
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from collections import Counter
+
+from .batch import convert_directory, write_summary
+from .cache import DEFAULT_MAX_BYTES
+from .detect import AUTO
+from .formats import PARSERS, format_4
+from .metrics import PROFILES, MetricsWriter
+from .reconcile import describe_issue
+from .sinks import DEFAULT_OUTPUTS, SINKS
+from .service import DEFAULT_TTL, JobService, serve
+from .watch import watch_directory
+
+
+def print_result(result):
+    """Cetak satu baris progress per file"""
+    name = os.path.basename(result['file'])
+    if result['status'] == 'ok':
+        cached = ''
+        if result.get('cache') == 'hit':
+            cached = ' (cache)'
+        elif result.get('cache') not in ('', 'miss', None):
+            cached = f" (cache {result['cache']})"
+        print(f"✅ {name} [{result['format']}]: {result['rows']:,} rows, {result['pages']} pages, "
+              f"{result['seconds']:.2f}s{cached}")
+        if result.get('check', '').startswith('fail'):
+            report = result['reconcile']
+            print(f"   ⚠️  saldo tidak cocok: {result['check'][len('fail: '):]}")
+            for issue in report['issues'][:3]:
+                print(f"      {describe_issue(issue)}")
+    elif result['status'] == 'unknown':
+        print(f"❓ {name}: format tidak dikenali (confidence {result['confidence']})")
+    else:
+        print(f"❌ {name}: {result['error']}")
+
+
+def result_printer(args):
+    """on_result untuk convert/watch: cetak progress dan tulis --metrics"""
+    if not args.metrics:
+        return print_result
+    writer = MetricsWriter(args.metrics)
+
+    def on_result(result):
+        print_result(result)
+        writer.write(result)
+
+    return on_result
+
+
+def cmd_convert(args):
+    output_dir = args.output or os.path.join(args.input_dir, 'output')
+
+    print(f"🔄 Converting {args.input_dir} ({args.format}, workers={args.workers or os.cpu_count()})\n")
+    start = time.perf_counter()
+    results = convert_directory(
+        args.input_dir, args.format, output_dir,
+        workers=args.workers, recursive=args.recursive, on_result=result_printer(args),
+        page_workers=args.page_workers, outputs=args.outputs,
+        cache_dir=args.cache, cache_bytes=args.cache_size * 2**20,
+        metrics=bool(args.metrics), profile=args.profile,
+    )
+    elapsed = time.perf_counter() - start
+
+    summary_path = os.path.join(output_dir, 'summary.csv')
+    write_summary(results, summary_path)
+
+    ok = [r for r in results if r['status'] == 'ok']
+    unknown = [r for r in results if r['status'] == 'unknown']
+    failed = [r for r in results if r['status'] == 'error']
+    total_rows = sum(r['rows'] for r in ok)
+    page_paths = Counter()
+    for r in results:
+        for item in filter(None, r.get('page_paths', '').split(';')):
+            name, count = item.split('=')
+            page_paths[name] += int(count)
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Files      : {len(results):,}")
+    print(f"Berhasil   : {len(ok):,}")
+    print(f"Gagal      : {len(failed):,}")
+    print(f"Tak dikenal: {len(unknown):,}")
+    print(f"Transaksi  : {total_rows:,}")
+    mismatched = [r for r in ok if r.get('check', '').startswith('fail')]
+    if mismatched:
+        print(f"Saldo beda : {len(mismatched):,} file (lihat kolom check di ringkasan)")
+    if page_paths:
+        print(f"Jalur parse: {', '.join(f'{k}={v:,}' for k, v in sorted(page_paths.items()))}")
+    print(f"Waktu      : {elapsed:.2f}s")
+    print(f"Ringkasan  : {summary_path}")
+    if args.metrics:
+        print(f"Metrics    : {args.metrics}")
+    print("=" * 70)
+
+    return 1 if failed or unknown else 0
+
+
+def cmd_watch(args):
+    output_dir = args.output or os.path.join(args.input_dir, 'output')
+    stop = []
+
+    def request_stop(signum, frame):
+        if not stop:
+            print("\n⏹️  Berhenti setelah konversi yang sedang berjalan selesai...")
+        stop.append(signum)
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    print(f"👀 Watching {args.input_dir} ({args.format}, workers={args.workers or os.cpu_count()}, "
+          f"settle={args.settle}s) → {output_dir}\n")
+    processed = watch_directory(
+        args.input_dir, args.format, output_dir,
+        workers=args.workers, on_result=result_printer(args), page_workers=args.page_workers,
+        outputs=args.outputs, cache_dir=args.cache, cache_bytes=args.cache_size * 2**20,
+        settle=args.settle, poll=args.poll, max_running=args.max_running, once=args.once,
+        should_stop=lambda: bool(stop), metrics=bool(args.metrics), profile=args.profile,
+    )
+    print(f"\nFiles diproses: {processed:,} (ringkasan: {os.path.join(output_dir, 'summary.csv')})")
+    return 0
+
+
+def cmd_serve(args):
+    async def run():
+        service = JobService(args.work_dir, workers=args.workers, queue_size=args.queue_size,
+                             timeout=args.timeout, max_upload=args.max_upload * 2**20, cache_dir=args.cache,
+                             metrics=args.metrics, ttl=args.job_ttl or None)
+        async with service:
+            await serve(service, args.host, args.port, ready=lambda server: print(
+                f"🌐 Listening on http://{args.host}:{args.port} (workers={service.workers}, "
+                f"queue={args.queue_size}, timeout={args.timeout}s, work dir {args.work_dir})"
+            ))
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n⏹️  Server dihentikan")
+    return 0
+
+
+def output_list(value):
+    outputs = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in outputs if name not in SINKS]
+    if unknown or not outputs:
+        raise argparse.ArgumentTypeError(f"output tidak dikenal: {', '.join(unknown) or value}")
+    return outputs
+
+
+def add_type_arguments(parser):
+    parser.add_argument('--bca-types', metavar='PATH',
+                        help='file JSON kode transaksi BCA tambahan (format_4): '
+                             '{"KATA KUNCI": ["Tipe Transaksi", "DB"|"CR"|null]}')
+
+
+def use_bca_types(path):
+    """Pasang kode transaksi tambahan di proses ini dan (lewat environment) di setiap worker"""
+    format_4.use_transaction_types(format_4.load_transaction_types(path))
+    os.environ[format_4.TYPES_ENV] = os.path.abspath(path)
+
+
+def add_conversion_arguments(parser):
+    """Opsi konversi yang sama untuk convert dan watch"""
+    parser.add_argument('--format', default=AUTO, choices=[AUTO] + sorted(PARSERS),
+                        help='format rekening koran (default: deteksi otomatis dari halaman pertama)')
+    parser.add_argument('-o', '--output', help='folder output (default: INPUT_DIR/output)')
+    parser.add_argument('--outputs', type=output_list, default=list(DEFAULT_OUTPUTS),
+                        help=f"jenis output dipisah koma: {', '.join(SINKS)} (default: {','.join(DEFAULT_OUTPUTS)})")
+    parser.add_argument('--workers', type=int, default=None, help='jumlah proses (default: jumlah CPU)')
+    parser.add_argument('--page-workers', type=int, default=None,
+                        help='bagi halaman satu PDF ke N proses (untuk rekening koran ratusan halaman, '
+                             'sebaiknya dengan --workers 1)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='folder cache hasil parsing dan template layout; PDF yang isinya sama tidak di-parse ulang')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // 2**20, metavar='MB',
+                        help='batas ukuran cache, entry lama dibuang duluan (default: %(default)s)')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='tulis waktu per tahap dan per halaman: JSON lines, atau teks Prometheus '
+                             'jika berakhiran .prom')
+    parser.add_argument('--profile', choices=PROFILES,
+                        help='profil per tahap: cprofile (file .prof di OUTPUT/profile) atau tracemalloc '
+                             '(puncak alokasi, masuk ke --metrics)')
+    add_type_arguments(parser)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='rekening_koran', description='Konversi PDF rekening koran ke Excel/CSV')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help='konversi semua PDF di satu folder')
+    convert.add_argument('input_dir', help='folder berisi file PDF')
+    add_conversion_arguments(convert)
+    convert.add_argument('--recursive', action='store_true', help='ikut proses sub-folder')
+    convert.set_defaults(func=cmd_convert)
+
+    watch = commands.add_parser('watch', help='pantau folder inbox dan konversi PDF yang baru masuk')
+    watch.add_argument('input_dir', help='folder inbox; PDF selesai dipindah ke processed/ atau failed/')
+    add_conversion_arguments(watch)
+    watch.add_argument('--settle', type=float, default=2.0, metavar='DETIK',
+                       help='file dianggap selesai diupload jika tidak berubah selama ini (default: %(default)s)')
+    watch.add_argument('--poll', type=float, default=1.0, metavar='DETIK',
+                       help='jeda antar scan folder (default: %(default)s)')
+    watch.add_argument('--max-running', type=int, default=None, metavar='N',
+                       help='batas file yang dikonversi sekaligus, sisanya antre (default: jumlah worker)')
+    watch.add_argument('--once', action='store_true', help='berhenti setelah inbox kosong')
+    watch.set_defaults(func=cmd_watch)
+
+    serve = commands.add_parser('serve', help='HTTP API: kirim PDF, cek status job, ambil hasil')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--work-dir', default='rekening_koran_jobs', metavar='DIR',
+                       help='folder PDF dan hasil setiap job (default: %(default)s)')
+    serve.add_argument('--workers', type=int, default=None, help='job yang dikonversi sekaligus (default: jumlah CPU)')
+    serve.add_argument('--queue-size', type=int, default=100, metavar='N',
+                       help='batas job yang antre; lebih dari ini dijawab 503 (default: %(default)s)')
+    serve.add_argument('--timeout', type=float, default=300, metavar='DETIK',
+                       help='batas waktu konversi per job (default: %(default)s)')
+    serve.add_argument('--max-upload', type=int, default=100, metavar='MB',
+                       help='batas ukuran PDF (default: %(default)s)')
+    serve.add_argument('--job-ttl', type=float, default=DEFAULT_TTL, metavar='DETIK',
+                       help='job selesai dan filenya dihapus setelah sekian detik; 0 = simpan sampai DELETE '
+                            '(default: %(default)s)')
+    serve.add_argument('--cache', metavar='DIR', help='folder cache hasil parsing dan template layout')
+    serve.add_argument('--metrics', action='store_true',
+                       help='ukur waktu per tahap setiap job; hasil di job dan GET /metrics')
+    add_type_arguments(serve)
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.bca_types:
+        try:
+            use_bca_types(args.bca_types)
+        except (OSError, ValueError) as e:
+            parser.error(f"--bca-types: {e}")
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
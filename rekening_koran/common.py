@@ -0,0 +1,141 @@
+"""Fungsi bantu yang dipakai bersama oleh semua format rekening koran."""
+
+import re
+
+import pandas as pd
+
+from .numbers import convert_column, parse_amounts
+
+
+# ============================================================
+# FUNGSI PEMBERSIH KARAKTER
+# ============================================================
+def clean_text(text):
+    """Bersihkan karakter aneh dari text"""
+    if pd.isna(text) or text == '':
+        return ''
+
+    text = str(text)
+    text = re.sub(r'[^\x20-\x7E\n]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+# ============================================================
+# FUNGSI KONVERSI FORMAT ANGKA (US → ID)
+# ============================================================
+def convert_to_indonesian_format(value):
+    """Konversi format angka dari 222,432.00 menjadi 222.432,00 (satu nilai)"""
+    return convert_column([value])[0][0]
+
+
+# ============================================================
+# FUNGSI UNTUK CEK APAKAH STRING ADALAH ANGKA
+# ============================================================
+def is_number(s):
+    """Cek apakah string adalah format angka"""
+    s = str(s).strip()
+    s_clean = s.replace(',', '').replace('.', '').replace('-', '')
+    return s_clean.isdigit() and len(s_clean) > 0
+
+
+def page_text(page):
+    """Ambil text halaman, string kosong jika halaman tidak punya text"""
+    return page.extract_text() or ''
+
+
+
+# ============================================================
+# BARIS KATA DAN SAMBUNGAN DESKRIPSI (TEXT TERPOTONG KE BARIS BERIKUTNYA)
+# ============================================================
+# Kata dengan selisih top <= ini dianggap satu baris
+ROW_TOLERANCE = 3
+# Batas baris sambungan per transaksi; lebih dari ini hampir pasti bukan deskripsi
+MAX_WRAPPED_LINES = 3
+# Kelonggaran posisi x (pt) saat mencocokkan baris sambungan dengan kolom deskripsi
+COLUMN_SLACK = 2
+
+
+def group_rows(words):
+    """Kelompokkan kata menjadi baris berdasarkan top, urut dari atas lalu kiri"""
+    rows = []
+    row_top = None
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        if row_top is None or word['top'] - row_top > ROW_TOLERANCE:
+            rows.append([])
+            row_top = word['top']
+        rows[-1].append(word)
+    return rows
+
+
+def in_column(words, previous, span):
+    """
+    Baris kata ada di kolom deskripsi span (x0, x1) tepat di bawah baris previous:
+    kata pertama mulai di kanan x0, kata terakhir selesai sebelum x1, dan jarak
+    vertikalnya tidak lebih dari tinggi satu baris (footer halaman biasanya di
+    kiri, lebih lebar dari kolom, atau terpisah jauh)
+    """
+    x0, x1 = span
+    gap = words[0]['top'] - max(w['bottom'] for w in previous)
+    height = max(w['bottom'] - w['top'] for w in previous)
+    return (
+        words[0]['x0'] >= x0 - COLUMN_SLACK
+        and max(w['x1'] for w in words) <= x1 + COLUMN_SLACK
+        and gap <= height
+    )
+
+
+def stitch_rows(word_rows, parse_line, is_continuation, desc_index, desc_span, max_wrapped=MAX_WRAPPED_LINES):
+    """
+    Baris transaksi dari baris kata satu halaman (group_rows), dalam satu kali jalan tanpa mundur
+    parse_line(text): list baris mentah, atau None jika bukan baris transaksi
+    desc_span(words): (x0, x1) kolom deskripsi pada baris transaksi itu
+    Baris lain disambung ke deskripsi (kolom desc_index) transaksi terakhir hanya
+    jika posisinya di kolom deskripsi tepat di bawahnya (in_column) dan
+    is_continuation(text) tidak menolaknya; baris lain menutup transaksi itu
+    """
+    rows = []
+    current = None
+    wrapped = 0
+    previous = None
+    for words in word_rows:
+        text = ' '.join(word['text'] for word in words)
+        row = parse_line(text)
+        if row is not None:
+            rows.append(row)
+            current, wrapped, span = row, 0, desc_span(words)
+        elif (current is not None and wrapped < max_wrapped and in_column(words, previous, span)
+              and is_continuation(text)):
+            current[desc_index] = f"{current[desc_index]} {text}" if current[desc_index] else text
+            wrapped += 1
+        else:
+            current = None
+        previous = words
+    return rows
+
+
+# ============================================================
+# RECORD BESERTA NOMINAL EXACT
+# ============================================================
+class Records(list):
+    """
+    Record satu halaman hasil finalize_rows beserta nominalnya dalam sen
+    amounts: {nama kolom: (sen int64, valid)}; valid False untuk nilai kosong
+    atau text yang bukan angka. Output bertipe dan cek saldo memakai sen ini
+    langsung, bukan membaca ulang text yang sudah diformat
+    """
+
+    def __init__(self, records=(), amounts=None):
+        super().__init__(records)
+        self.amounts = amounts or {}
+
+
+def column_amounts(records, index, name):
+    """
+    (sen, valid) kolom name (posisi index di record): dari records.amounts jika
+    parser menyediakannya, selain itu dibaca dari text record
+    """
+    amounts = getattr(records, 'amounts', None)
+    if amounts and name in amounts:
+        return amounts[name]
+    return parse_amounts([record[index] for record in records])
@@ -0,0 +1,122 @@
+"""Konversi satu file PDF rekening koran ke XLSX, CSV atau Parquet."""
+
+import os
+import time
+from contextlib import ExitStack
+
+from .cache import DEFAULT_MAX_BYTES, RowCache
+from .detect import AUTO, detect_format
+from .formats import get_parser
+from .layouts import use_layout_dir
+from .metrics import collect, stage
+from .page import open_pdf
+from .reconcile import Reconciler, summarize
+from .sinks import DEFAULT_OUTPUTS, open_sinks
+from .stream import write_statement
+
+
+def convert_file(pdf_path, format_name, output_dir, page_workers=None, outputs=DEFAULT_OUTPUTS,
+                 cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES, metrics=False, profile=None, check=True,
+                 stem=None):
+    """
+    Konversi satu PDF dan simpan hasilnya di output_dir
+    format_name 'auto' mendeteksi format dari halaman pertama
+    page_workers > 1 mengaktifkan ekstraksi paralel per halaman
+    cache_dir: folder cache baris mentah dan template layout; file yang isinya
+    sama tidak di-parse ulang
+    metrics: ukur waktu per tahap dan per halaman, hasilnya di result['metrics']
+    profile: 'cprofile' (file .prof per tahap di output_dir/profile) atau
+    'tracemalloc'; otomatis mengaktifkan metrics
+    check: cek saldo berjalan dan saldo/total dari PDF; ringkasan di result['check'],
+    rincian di result['reconcile']
+    stem: nama file output tanpa ekstensi (default: nama PDF), mis. 'a__statement'
+    untuk PDF di sub-folder supaya tidak bentrok dengan PDF lain yang namanya sama
+    Return: dict hasil konversi (status, jumlah baris, waktu, error)
+    """
+    result = {
+        'file': pdf_path,
+        'format': format_name,
+        'status': 'ok',
+        'confidence': '',
+        'pages': 0,
+        'rows': 0,
+        'seconds': 0.0,
+        'outputs': '',
+        'cache': '',
+        'page_paths': '',
+        'check': '',
+        'error': '',
+    }
+    start = time.perf_counter()
+    stem = stem or os.path.splitext(os.path.basename(pdf_path))[0]
+
+    cache = RowCache(cache_dir, cache_bytes) if cache_dir else None
+    use_layout_dir(cache_dir)
+    opened = ExitStack()
+    collector = None
+    if metrics or profile:
+        prefix = os.path.join(output_dir, 'profile', stem)
+        collector = opened.enter_context(collect(profile, prefix))
+
+    try:
+        if format_name == AUTO:
+            # File yang sudah ada di cache tidak perlu dibuka untuk deteksi
+            cached_format = cache.cached_format(pdf_path) if cache else None
+            if cached_format:
+                format_name = cached_format
+            else:
+                # PDF tetap terbuka sampai selesai, jadi halaman pertama tidak di-layout dua kali
+                opened.enter_context(open_pdf(pdf_path))
+                with stage('detect'):
+                    format_name, result['confidence'] = detect_format(pdf_path)
+            if format_name is None:
+                result['status'] = 'unknown'
+                result['error'] = 'Format tidak dikenali'
+                result['seconds'] = round(time.perf_counter() - start, 3)
+                return result
+            result['format'] = format_name
+
+        parser = get_parser(format_name)
+        paths = getattr(parser, 'PAGE_PATHS', None)
+        paths_before = paths.copy() if paths is not None else None
+        sinks = []
+        reconciler = Reconciler(parser) if check else None
+
+        def open_all():
+            sinks.extend(open_sinks(pdf_path, parser, output_dir, outputs, stem))
+            # Reconciler menerima record yang sama dengan sink
+            return sinks + [reconciler] if reconciler else sinks
+
+        info, result['rows'], result['pages'] = write_statement(pdf_path, parser, open_all, page_workers, cache)
+        if paths is not None:
+            # Jalur parsing yang dipakai untuk file ini saja, mis. 'no_lines=3;tables=12'
+            result['page_paths'] = ';'.join(f"{k}={v}" for k, v in sorted((paths - paths_before).items()))
+        if cache:
+            if cache.hits:
+                result['cache'] = 'hit'
+            elif cache.page_hits:
+                # Sebagian halaman sudah pernah di-parse (mis. statement month-to-date)
+                result['cache'] = f"{cache.page_hits}/{result['pages']} pages"
+            else:
+                result['cache'] = 'miss'
+
+        if not result['rows']:
+            raise ValueError('Tidak ada data transaksi yang berhasil di-extract')
+        if reconciler:
+            result['reconcile'] = reconciler.finish(info)
+            result['check'] = summarize(result['reconcile'])
+
+        result['outputs'] = ';'.join(sink.path for sink in sinks)
+
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if collector is not None:
+            result['metrics'] = collector.report()
+        opened.close()
+        if cache:
+            cache.close()
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
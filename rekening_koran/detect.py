@@ -0,0 +1,58 @@
+"""Deteksi format rekening koran dari text halaman pertama."""
+
+import re
+
+from .common import page_text
+from .formats import PARSERS
+from .page import open_pdf
+
+# Nama format khusus untuk deteksi otomatis
+AUTO = 'auto'
+
+# Cukup beberapa KB pertama; header dan baris transaksi awal sudah ada di sana
+DETECT_CHARS = 8192
+
+# Skor minimal dan selisih minimal dengan format kedua supaya hasil dipercaya
+MIN_CONFIDENCE = 0.5
+MIN_MARGIN = 0.25
+
+_COMPILED = {
+    name: [(re.compile(pattern, re.MULTILINE), weight) for pattern, weight in parser.SIGNATURES]
+    for name, parser in PARSERS.items()
+}
+
+
+def score_text(text):
+    """Skor 0..1 untuk setiap format: bobot penanda yang cocok / total bobot"""
+    text = text[:DETECT_CHARS]
+    scores = {}
+    for name, signatures in _COMPILED.items():
+        total = sum(weight for _, weight in signatures)
+        matched = sum(weight for pattern, weight in signatures if pattern.search(text))
+        scores[name] = matched / total if total else 0.0
+    return scores
+
+
+def detect_text(text):
+    """
+    Tentukan format dari text halaman pertama
+    Return: (nama_format atau None jika tidak yakin, confidence)
+    """
+    scores = score_text(text)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    best_name, best = ranked[0]
+    second = ranked[1][1] if len(ranked) > 1 else 0.0
+
+    if best < MIN_CONFIDENCE or best - second < MIN_MARGIN:
+        return None, round(best, 3)
+    return best_name, round(best, 3)
+
+
+def detect_format(pdf_path):
+    """Tentukan format file PDF hanya dari halaman pertama"""
+    # Jika PDF sedang dibuka convert_file, PageView halaman pertama dipakai ulang
+    # oleh read_info dan parse_page sesudahnya
+    with open_pdf(pdf_path) as doc:
+        if not len(doc):
+            return None, 0.0
+        return detect_text(page_text(doc.page(0)))
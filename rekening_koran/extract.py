@@ -0,0 +1,126 @@
+"""Baca PDF halaman per halaman dengan parser format yang dipilih."""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .formats import get_parser
+from .metrics import collect, current, stage
+from .page import Document, open_pdf
+
+# Minimal jumlah halaman per potongan saat ekstraksi paralel;
+# di bawah ini biaya membuka ulang PDF lebih besar dari hasilnya
+MIN_PAGES_PER_CHUNK = 8
+
+
+def page_ranges(total_pages, workers, min_pages=MIN_PAGES_PER_CHUNK):
+    """Bagi halaman 0..total_pages menjadi potongan (start, stop) yang berurutan"""
+    if total_pages == 0:
+        return []
+    # 4 potongan per worker supaya halaman berat tidak menumpuk di satu proses
+    chunk = max(min_pages, -(-total_pages // (workers * 4)))
+    return [(start, min(start + chunk, total_pages)) for start in range(0, total_pages, chunk)]
+
+
+def parse_page_range(pdf_path, format_name, start, stop, state, cache_spec=None, metrics_spec=None):
+    """
+    Buka ulang PDF dan parse halaman start..stop (dijalankan di worker)
+    cache_spec: (cache_dir, max_bytes) untuk membuka RowCache di worker
+    metrics_spec: (profile, prefix) jika pengukuran aktif di proses utama
+    Return: (list (page_key, rows) per halaman, Counter PAGE_PATHS di worker ini,
+    hasil Metrics.export() atau None); page_key None tanpa cache
+    """
+    parser = get_parser(format_name)
+    paths = getattr(parser, 'PAGE_PATHS', Counter())
+    before = paths.copy()
+
+    if metrics_spec is None:
+        pages = parse_views(pdf_path, parser, start, stop, state, cache_spec)
+        return pages, paths - before, None
+
+    profile, prefix = metrics_spec
+    # Profil cProfile setiap potongan halaman disimpan terpisah
+    with collect(profile, prefix and f"{prefix}.p{start + 1}-{stop}") as metrics:
+        pages = parse_views(pdf_path, parser, start, stop, state, cache_spec)
+    return pages, paths - before, metrics.export()
+
+
+def parse_views(pdf_path, parser, start, stop, state, cache_spec=None):
+    """Parse halaman start..stop dari PDF yang dibuka ulang; list (page_key, rows)"""
+    doc = Document(pdf_path, pages=range(start + 1, stop + 1))
+    try:
+        if cache_spec is None:
+            return [parse_one(doc.page(index), parser, state) for index in range(len(doc))]
+
+        # Import di sini: modul cache sendiri memakai modul ini
+        from .cache import RowCache
+
+        memo = {}
+        with RowCache(*cache_spec) as cache:
+            return [parse_one(doc.page(index), parser, state, cache, memo) for index in range(len(doc))]
+    finally:
+        doc.close()
+
+
+def parse_one(page, parser, state, cache=None, memo=None):
+    """
+    (page_key, rows) satu halaman, lewat cache jika ada; diukur sebagai tahap parse
+    Halaman yang ada di cache tidak di-layout sama sekali
+    """
+    with stage('parse', page.page_number):
+        if cache is None:
+            # Layout pdfminer diukur terpisah, apa pun yang pertama kali menyentuh halaman
+            page.load_objects()
+            return None, parser.parse_page(page, state)
+        return cache.parse_page(page, parser, state, memo)
+
+
+def iter_keyed_page_rows(pdf_path, parser, info, page_workers=None, cache=None):
+    """
+    Generator (nomor_halaman, page_key, baris_mentah) untuk setiap halaman, berurutan
+    info diisi dengan info rekening dari halaman pertama sebelum halaman pertama di-yield
+    page_workers > 1 membagi halaman ke beberapa proses; urutan baris tetap
+    sama persis dengan mode berurutan
+    cache: RowCache opsional; halaman yang isinya sudah pernah di-parse diambil
+    dari cache (page_key adalah kuncinya, None tanpa cache)
+    """
+    state = {}
+
+    with open_pdf(pdf_path) as doc:
+        total_pages = len(doc)
+        if total_pages:
+            # Halaman pertama dibaca read_info dan parse_page dari PageView yang sama;
+            # layout-nya tetap tercatat sebagai tahap layout lewat page_text
+            first_page = doc.page(0)
+            with stage('info', 1):
+                info.update(parser.read_info(first_page, state))
+
+        ranges = page_ranges(total_pages, page_workers) if page_workers and page_workers > 1 else []
+        if len(ranges) <= 1:
+            memo = {}
+            for index in range(total_pages):
+                yield index + 1, *parse_one(doc.page(index), parser, state, cache, memo)
+                # Lepaskan cache layout halaman yang sudah selesai
+                doc.release(index)
+            return
+
+        # Halaman pertama tidak lagi dipakai di proses ini
+        doc.release(0)
+
+    cache_spec = (cache.cache_dir, cache.max_bytes) if cache is not None else None
+    metrics = current()
+    metrics_spec = (metrics.profile, metrics.prefix) if metrics is not None else None
+    with ProcessPoolExecutor(max_workers=min(page_workers, len(ranges))) as pool:
+        futures = [
+            pool.submit(parse_page_range, pdf_path, parser.NAME, start, stop, state, cache_spec, metrics_spec)
+            for start, stop in ranges
+        ]
+        # Yield sesuai urutan halaman, bukan urutan selesai
+        for (start, _), future in zip(ranges, futures):
+            pages, paths, exported = future.result()
+            # Gabungkan hitungan jalur parsing dan pengukuran dari worker
+            if hasattr(parser, 'PAGE_PATHS'):
+                parser.PAGE_PATHS.update(paths)
+            if exported is not None:
+                metrics.merge(exported)
+            for offset, (page_key, rows) in enumerate(pages):
+                yield start + offset + 1, page_key, rows
@@ -0,0 +1,41 @@
+"""Parser untuk setiap format rekening koran.
+
+Setiap modul format menyediakan antarmuka yang sama:
+
+- ``NAME``, ``VERSION`` (naikkan jika hasil parsing berubah; dipakai kunci cache), ``OUTPUT_NAME``, ``COLUMNS`` (baris mentah) dan ``OUTPUT_COLUMNS``
+- ``Transaction``: namedtuple untuk satu baris output
+- ``INFO_SHEET``, ``INFO_HEADER``, ``DATA_SHEET``, ``AUTO_WIDTH`` dan ``DEDUPLICATE``
+- ``SIGNATURES``: penanda untuk deteksi format otomatis
+- ``read_info(page, state)``: info rekening dari halaman pertama (``page`` adalah
+  ``page.PageView``; text dan kata satu halaman hanya dihitung sekali)
+- ``parse_page(page, state)``: baris mentah dari satu halaman
+- ``finalize_rows(rows, info)``: record ``Transaction`` dari baris mentah satu halaman
+- ``finish_info(info, total)``: hitung info akhir setelah semua halaman
+- ``info_rows(info, total)``: isi sheet info
+- ``COLUMN_TYPES`` (opsional): tipe kolom output parquet/arrow, lihat ``sinks.ArrowBatches``
+- ``DB_COLUMNS`` dan ``ACCOUNT_INFO``: kolom dan nomor rekening untuk output database (``sinks.SqliteSink``)
+  dan cek saldo berjalan (``reconcile.Reconciler``)
+- ``BALANCE_INFO`` (opsional): kunci info saldo awal/akhir dan total debit/kredit dari PDF
+  (``opening``, ``closing``, ``debit``, ``credit``) untuk dicocokkan saat rekonsiliasi
+- ``PAGE_PATHS`` (opsional): ``Counter`` jumlah halaman per jalur parsing
+"""
+
+from . import format_1, format_2, format_3, format_4
+
+PARSERS = {
+    format_1.NAME: format_1,
+    format_2.NAME: format_2,
+    format_3.NAME: format_3,
+    format_4.NAME: format_4,
+}
+
+
+def get_parser(name):
+    """Ambil modul parser berdasarkan nama format"""
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Format tidak dikenal: {name} (pilihan: {', '.join(PARSERS)})") from None
+
+
+__all__ = ['PARSERS', 'get_parser', 'format_1', 'format_2', 'format_3', 'format_4']
@@ -0,0 +1,180 @@
+"""Format 1 - rekening koran dengan header Nama Tercetak / Nomor Rekening.
+
+Tabel transaksi 9 kolom, dibaca dengan extract_tables() dan extract_text()
+sebagai cadangan jika tabel tidak terdeteksi.
+"""
+
+import hashlib
+import re
+from collections import Counter, namedtuple
+
+from ..common import Records, page_text
+from ..numbers import convert_amounts
+
+NAME = 'format_1'
+VERSION = 1
+OUTPUT_NAME = 'rekening_koran'
+
+COLUMNS = [
+    'No', 'Tgl dan Waktu', 'No Referensi', 'Deskripsi',
+    'Kode', 'D/K', 'Debit', 'Kredit', 'Saldo'
+]
+OUTPUT_COLUMNS = COLUMNS
+
+# Tipe kolom untuk output parquet/arrow; kolom lain string
+COLUMN_TYPES = {
+    'No': 'int',
+    'Tgl dan Waktu': ('timestamp', ['%d/%m/%y %H:%M', '%d/%m/%y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S']),
+    'Debit': 'decimal', 'Kredit': 'decimal', 'Saldo': 'decimal',
+}
+
+# Output database: kolom tanggal, uraian, debit, kredit, saldo dan label nomor rekening di info_rows
+DB_COLUMNS = ('Tgl dan Waktu', 'Deskripsi', 'Debit', 'Kredit', 'Saldo')
+ACCOUNT_INFO = 'No Rek'
+
+Transaction = namedtuple('Transaction', [
+    'no', 'tgl_waktu', 'no_referensi', 'deskripsi',
+    'kode', 'dk', 'debit', 'kredit', 'saldo'
+])
+
+INFO_SHEET = 'Info'
+INFO_HEADER = None
+DATA_SHEET = 'Transaksi'
+AUTO_WIDTH = False
+
+# Buang baris yang sudah muncul di halaman sebelumnya (stream.clean_rows)
+DEDUPLICATE = True
+
+# Jumlah halaman per jalur parse_page: tables, tables_empty (tabel lalu text),
+# no_lines dan same_lines (langsung text tanpa extract_tables)
+PAGE_PATHS = Counter()
+
+# Penanda untuk deteksi format otomatis: (regex, bobot)
+SIGNATURES = [
+    (r'Nama Tercetak', 3),
+    (r'Nomor Rekening', 2),
+    (r'Tgl dan Waktu', 2),
+    (r'No Referensi', 1),
+    (r'\bD/K\b', 1),
+]
+
+
+def read_info(page, state):
+    """Ambil info rekening dari halaman pertama"""
+    info = {}
+    for line in page_text(page).split('\n'):
+        if 'Periode' in line and ':' in line:
+            info['Periode'] = line.split(':')[-1].strip()
+        if 'Nama Tercetak' in line and ':' in line:
+            info['Nama'] = line.split(':')[-1].strip()
+        if 'Nomor Rekening' in line and ':' in line:
+            info['No_Rek'] = line.split(':')[-1].strip()
+    return info
+
+
+def edge_signature(page):
+    """Hash semua garis/kotak halaman; tabel (strategi lines) hanya bergantung pada ini"""
+    edges = [(e['orientation'], e['x0'], e['top'], e['x1'], e['bottom']) for e in page.edges]
+    return hashlib.blake2b(repr((page.bbox, edges)).encode(), digest_size=16).hexdigest()
+
+
+def table_rows(tables):
+    """Baris data dari hasil extract_tables()"""
+    page_data = []
+
+    for table in tables or []:
+        if not table:
+            continue
+
+        for row in table:
+            if not row or len(row) < 9:
+                continue
+
+            # Skip headers
+            row_text = ' '.join([str(c) if c else '' for c in row]).lower()
+            if ('no.' in row_text and 'debit' in row_text) or 'tgl dan waktu' in row_text:
+                continue
+
+            # Check if valid data row
+            if row[0] or row[1]:  # Has number or date
+                page_data.append([str(c).strip() if c else '' for c in row[:9]])
+
+    return page_data
+
+
+def text_rows(page):
+    """Baris data dari extract_text(), kolom dipisah 2+ spasi"""
+    page_data = []
+
+    for line in page_text(page).split('\n'):
+        # Skip empty lines and headers
+        if not line.strip():
+            continue
+        if 'Debit' in line and 'Kredit' in line:
+            continue
+
+        # Format: No | Date | Ref | Desc | Code | D/K | Debit | Kredit | Saldo
+        parts = re.split(r'\s{2,}', line.strip())  # Split by 2+ spaces
+
+        if len(parts) >= 9:
+            # Check if first column is number
+            if parts[0].replace('.', '').isdigit():
+                page_data.append(parts[:9])
+
+    return page_data
+
+
+def parse_page(page, state):
+    """
+    Ambil baris transaksi dari satu halaman
+    extract_tables() hanya dijalankan jika halaman punya garis/kotak yang belum
+    terbukti tanpa tabel; hasilnya selalu sama dengan tabel dulu lalu text
+    """
+    page_data = []
+
+    # METHOD 1: extract_tables, kecuali pasti tidak ada tabel
+    if not page.edges:
+        # Strategi lines butuh garis; tanpa garis hasilnya pasti kosong
+        path = 'no_lines'
+    else:
+        signature = edge_signature(page)
+        if signature == state.get('tableless_edges'):
+            # Garis sama persis dengan halaman sebelumnya yang tidak punya tabel
+            path = 'same_lines'
+        else:
+            tables = page.extract_tables()
+            if not tables:
+                state['tableless_edges'] = signature
+            page_data = table_rows(tables)
+            path = 'tables' if page_data else 'tables_empty'
+
+    # METHOD 2: If no data from tables, try text extraction
+    if not page_data:
+        page_data = text_rows(page)
+
+    PAGE_PATHS[path] += 1
+    return page_data
+
+
+def finalize_rows(rows, info):
+    """Format angka Debit, Kredit dan Saldo untuk baris satu halaman; sen-nya ikut di Records.amounts"""
+    # Tiga kolom angka dikonversi dalam satu panggilan
+    amounts, cents, valid = convert_amounts([value for row in rows for value in row[6:9]])
+    return Records(
+        [Transaction(*row[:6], *amounts[i * 3:i * 3 + 3]) for i, row in enumerate(rows)],
+        {name: (cents[k::3], valid[k::3]) for k, name in enumerate(COLUMNS[6:9])},
+    )
+
+
+def finish_info(info, total):
+    """Tidak ada info yang perlu dihitung ulang"""
+
+
+def info_rows(info, total):
+    """Isi sheet Info"""
+    return [
+        ['Periode', info.get('Periode', '')],
+        ['Nama', info.get('Nama', '')],
+        ['No Rek', info.get('No_Rek', '')],
+        ['Total', f"{total:,}"],
+    ]
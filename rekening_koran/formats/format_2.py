@@ -0,0 +1,192 @@
+"""Format 2 - rekening koran BSI (Account Statement dengan FT Number).
+
+Setiap transaksi satu baris text:
+Date Time | FT Number | Description ... | IDR | Amount | DB/CR | Balance
+"""
+
+import re
+from collections import namedtuple
+
+from ..common import Records, clean_text, convert_to_indonesian_format, group_rows, page_text, stitch_rows
+from ..numbers import convert_amounts
+
+NAME = 'format_2'
+VERSION = 3
+OUTPUT_NAME = 'rekening_koran_bsi'
+
+COLUMNS = ['Date', 'FT Number', 'Description', 'Currency', 'Debit', 'Credit', 'Balance']
+OUTPUT_COLUMNS = COLUMNS
+
+# Tipe kolom untuk output parquet/arrow; kolom lain string
+COLUMN_TYPES = {
+    'Date': ('timestamp', ['%Y-%m-%d %H:%M:%S']),
+    'Debit': 'decimal', 'Credit': 'decimal', 'Balance': 'decimal',
+}
+
+# Output database: kolom tanggal, uraian, debit, kredit, saldo dan label nomor rekening di info_rows
+DB_COLUMNS = ('Date', 'Description', 'Debit', 'Credit', 'Balance')
+ACCOUNT_INFO = 'Account'
+# Saldo dan total dari header untuk rekonsiliasi (kunci info)
+BALANCE_INFO = {
+    'opening': 'Opening_Balance', 'closing': 'Closing_Balance', 'debit': 'Total_Debit', 'credit': 'Total_Credit',
+}
+
+Transaction = namedtuple('Transaction', [
+    'date', 'ft_number', 'description', 'currency', 'debit', 'credit', 'balance'
+])
+
+INFO_SHEET = 'Info'
+INFO_HEADER = None
+DATA_SHEET = 'Transaksi'
+AUTO_WIDTH = False
+
+# Buang baris yang sudah muncul di halaman sebelumnya (stream.clean_rows)
+DEDUPLICATE = True
+
+# Penanda untuk deteksi format otomatis: (regex, bobot)
+SIGNATURES = [
+    (r'FT Number', 3),
+    (r'Account Statement', 2),
+    (r'^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\b', 2),
+    (r'\bIDR\s+[\d,.]+\s+(?:DB|CR)\b', 2),
+    (r'Opening Balance', 1),
+]
+
+
+# ============================================================
+# FUNGSI PARSING BARIS TRANSAKSI
+# ============================================================
+# Bagian depan baris: tanggal+jam, FT Number, lalu sisa description.
+# Empat token terakhir (IDR, amount, DB/CR, balance) dipotong dari belakang
+# dengan rsplit, jadi baris yang bukan transaksi gugur sebelum regex jalan
+_LINE_HEAD = re.compile(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s*(\S+)(.*)')
+
+_DB_CR = ('DB', 'CR')
+
+
+def _is_amount(token):
+    """is_number() untuk satu token tanpa spasi"""
+    return token.replace(',', '').replace('.', '').replace('-', '').isdigit()
+
+
+def parse_transaction_line(line):
+    """
+    Parse baris transaksi dengan validasi lebih ketat
+    Format: Date Time | FT Number | Description ... | IDR | Amount | DB/CR | Balance
+    Return: [Date, FT Number, Description, Currency, Debit, Credit, Balance]
+    """
+    parts = line.rsplit(None, 4)
+    if len(parts) != 5:
+        return None
+
+    head, currency, amount, db_cr, balance = parts
+    db_cr = db_cr.upper()
+    if db_cr not in _DB_CR or currency.upper() != 'IDR':
+        return None
+    if not _is_amount(amount) or not _is_amount(balance):
+        return None
+
+    match = _LINE_HEAD.match(head.lstrip())
+    if not match:
+        return None
+    date, ft_number, description = match.groups()
+
+    # Description = SEMUA yang ada antara FT Number dan IDR, spasi dirapikan
+    description = ' '.join(description.split())
+
+    # Amount langsung masuk ke kolom Debit atau Credit sesuai marker DB/CR
+    if db_cr == 'DB':
+        return [date, ft_number, description, 'IDR', amount, '', balance]
+    return [date, ft_number, description, 'IDR', '', amount, balance]
+
+
+def is_header_line(line):
+    """
+    Baris header/footer yang harus dibuang walau lolos pola transaksi
+    (baris 'Page ...' dan 'Date ...' tidak mungkin diawali tanggal)
+    """
+    return (
+        ('Date' in line and 'FT Number' in line and 'Description' in line)
+        or 'Account Statement' in line
+        or 'PT ASIA BARU BERKAH MAKASSAR' in line
+    )
+
+
+def parse_row(line):
+    """Baris transaksi, atau None (termasuk header yang lolos pola transaksi)"""
+    parsed = parse_transaction_line(line)
+    return parsed if parsed and not is_header_line(line) else None
+
+
+# Baris di kolom Description yang tetap menutup transaksi terakhir: tanggal baru, 'Label : nilai', nomor halaman
+_NOT_DESCRIPTION = re.compile(r'\d{4}-\d{2}-\d{2}\b|[A-Za-z][\w .]*\s:|Page\s+\d', re.IGNORECASE)
+
+
+def is_continuation(line):
+    """Sambungan Description yang terpotong ke baris berikutnya (posisinya dicek stitch_rows)"""
+    text = line.strip()
+    return bool(text) and not _NOT_DESCRIPTION.match(text) and not is_header_line(line)
+
+
+def description_span(words):
+    """Kolom Description baris transaksi: dari kata sesudah FT Number sampai sebelum IDR"""
+    # Kata: tanggal, jam, FT Number, description ..., IDR, amount, DB/CR, balance
+    x0 = words[3]['x0'] if len(words) > 7 else words[2]['x1']
+    return x0, words[-4]['x0']
+
+
+def read_info(page, state):
+    """Ambil info rekening dari halaman pertama"""
+    info = {}
+    for line in page_text(page).split('\n'):
+        if 'Account' in line and ':' in line and 'Statement' not in line:
+            info['Account'] = line.split(':', 1)[-1].strip()
+        elif line.startswith('Date') and ':' in line:
+            info['Periode'] = line.split(':', 1)[-1].strip()
+        elif 'Opening Balance' in line and ':' in line:
+            info['Opening_Balance'] = line.split(':', 1)[-1].strip()
+        elif 'Closing Balance' in line and ':' in line:
+            info['Closing_Balance'] = line.split(':', 1)[-1].strip()
+        elif 'Total Debit Amount' in line and ':' in line:
+            info['Total_Debit'] = line.split(':', 1)[-1].strip()
+        elif 'Total Credit Amount' in line and ':' in line:
+            info['Total_Credit'] = line.split(':', 1)[-1].strip()
+        elif 'Branch' in line and ':' in line:
+            info['Branch'] = line.split(':', 1)[-1].strip()
+    return info
+
+
+def parse_page(page, state):
+    """Ambil baris transaksi dari satu halaman; Description yang terpotong disambung"""
+    return stitch_rows(group_rows(page.extract_words()), parse_row, is_continuation, 2, description_span)
+
+
+def finalize_rows(rows, info):
+    """Bersihkan Description dan format Debit, Credit dan Balance; sen-nya ikut di Records.amounts"""
+    # Tiga kolom angka dikonversi dalam satu panggilan
+    amounts, cents, valid = convert_amounts([value for row in rows for value in row[4:7]])
+    return Records(
+        [Transaction(*row[:2], clean_text(row[2]), row[3], *amounts[i * 3:i * 3 + 3]) for i, row in enumerate(rows)],
+        {name: (cents[k::3], valid[k::3]) for k, name in enumerate(COLUMNS[4:7])},
+    )
+
+
+def finish_info(info, total):
+    """Konversi angka di header ke format Indonesia"""
+    for key in ['Opening_Balance', 'Closing_Balance', 'Total_Debit', 'Total_Credit']:
+        if key in info:
+            info[key] = convert_to_indonesian_format(info[key])
+
+
+def info_rows(info, total):
+    """Isi sheet Info"""
+    return [
+        ['Account', info.get('Account', '')],
+        ['Periode', info.get('Periode', '')],
+        ['Branch', info.get('Branch', '')],
+        ['Opening Balance', info.get('Opening_Balance', '')],
+        ['Closing Balance', info.get('Closing_Balance', '')],
+        ['Total Debit', info.get('Total_Debit', '')],
+        ['Total Credit', info.get('Total_Credit', '')],
+        ['Total Transaksi', f"{total:,}"],
+    ]
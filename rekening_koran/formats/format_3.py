@@ -0,0 +1,404 @@
+"""Format 3 - rekening koran BRI (Tanggal Transaksi / Teller).
+
+Kata di setiap halaman dimasukkan ke kolom berdasarkan posisi x header
+Teller/Debet/Kredit/Saldo, dan dikelompokkan menjadi baris berdasarkan top.
+Posisi kolom dan batas header halaman pertama disimpan sebagai template
+layout (lihat layouts.py); file berikutnya dengan layout yang sama langsung
+memakai template. Jika header tidak ditemukan, tabel dibaca dengan
+extract_tables() strategi text dan Debet, Kredit, Saldo diambil dari tiga
+angka terakhir setiap baris.
+"""
+
+import re
+from bisect import bisect_right
+from collections import Counter, namedtuple
+
+from ..common import Records, clean_text, group_rows, page_text
+from ..layouts import fingerprint, layout_store
+from ..numbers import convert_amounts, format_cents
+
+NAME = 'format_3'
+VERSION = 3
+OUTPUT_NAME = 'rekening_koran_bri'
+
+COLUMNS = [
+    'Tanggal Transaksi', 'Uraian Transaksi', 'Teller',
+    'Debet', 'Kredit', 'Saldo'
+]
+OUTPUT_COLUMNS = COLUMNS
+
+# Tipe kolom untuk output parquet/arrow; kolom lain string
+COLUMN_TYPES = {
+    'Tanggal Transaksi': ('timestamp', ['%d/%m/%y %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%d/%m/%y', '%d/%m/%Y']),
+    'Debet': 'decimal', 'Kredit': 'decimal', 'Saldo': 'decimal',
+}
+
+# Output database: kolom tanggal, uraian, debit, kredit, saldo dan label nomor rekening di info_rows
+DB_COLUMNS = ('Tanggal Transaksi', 'Uraian Transaksi', 'Debet', 'Kredit', 'Saldo')
+ACCOUNT_INFO = 'No. Rekening'
+
+Transaction = namedtuple('Transaction', ['tanggal', 'uraian', 'teller', 'debet', 'kredit', 'saldo'])
+
+INFO_SHEET = 'Info'
+INFO_HEADER = None
+DATA_SHEET = 'Transaksi'
+AUTO_WIDTH = False
+
+# Buang baris yang sudah muncul di halaman sebelumnya (stream.clean_rows)
+DEDUPLICATE = True
+
+# Jumlah halaman per jalur parse_page: layout (template), columns (posisi header) atau tables
+PAGE_PATHS = Counter()
+
+# Penanda untuk deteksi format otomatis: (regex, bobot)
+SIGNATURES = [
+    (r'Tanggal Transaksi|Transaction Date', 3),
+    (r'Uraian Transaksi', 2),
+    (r'\bTeller\b', 2),
+    (r'Periode Transaksi|Transaction Period', 1),
+    (r'^\d{2}/\d{2}/\d{2,4}\s+\d{2}:\d{2}', 1),
+]
+
+
+def read_info(page, state):
+    """Ambil info rekening dan posisi kolom dari halaman pertama"""
+    info = {}
+    lines = page_text(page).split('\n')
+
+    for i, line in enumerate(lines):
+        if 'Kepada Yth' in line or 'To :' in line:
+            if i + 1 < len(lines):
+                info['Nama'] = lines[i + 1].strip()
+
+        if 'No. Rekening' in line or 'Account No' in line:
+            match = re.search(r':?\s*(\d+)', line)
+            if match:
+                info['No_Rekening'] = match.group(1)
+
+        if 'Periode Transaksi' in line or 'Transaction Period' in line:
+            match = re.search(r':?\s*(\d{2}/\d{2}/\d{2,4}\s*-\s*\d{2}/\d{2}/\d{2,4})', line)
+            if match:
+                info['Periode'] = match.group(1)
+
+        if 'Nama Produk' in line or 'Product Name' in line:
+            parts = line.split(':')
+            if len(parts) > 1:
+                info['Produk'] = parts[1].strip()
+
+    # Posisi kolom dari template layout, atau cari header table lalu simpan templatenya
+    template = read_layout(page)
+    state['columns'] = template and template['columns']
+    if template:
+        state['layout'] = template
+
+    return info
+
+
+# ============================================================
+# KOLOM BERDASARKAN POSISI HEADER
+# ============================================================
+HEADER_WORDS = {
+    'Teller': 'teller', 'User': 'teller',
+    'Debet': 'debet', 'Debit': 'debet',
+    'Kredit': 'kredit', 'Credit': 'kredit',
+    'Saldo': 'saldo', 'Balance': 'saldo',
+}
+COLUMN_ORDER = ['teller', 'debet', 'kredit', 'saldo']
+
+# Kata penanda sidik jari layout: header kolom ditambah judul tanggal/uraian,
+# hanya yang di atas baris transaksi pertama (isi transaksi tidak ikut)
+LAYOUT_MARKS = set(HEADER_WORDS) | {'Tanggal', 'Transaksi', 'Uraian', 'Transaction', 'Date'}
+# Header halaman dianggap sama dengan template jika posisi kolomnya bergeser <= ini (pt)
+LAYOUT_TOLERANCE = 1
+
+# Teller rata kiri: batasnya sedikit di kiri header
+TELLER_MARGIN = 5
+
+DATE_PREFIX = re.compile(r'(\d{2}/\d{2}/\d{2,4}(?:\s+\d{2}:\d{2}:\d{2})?)\s*')
+DATE_WORD = re.compile(r'\d{2}/\d{2}/\d{2,4}')
+AMOUNT = re.compile(r'\d{1,3}(?:,\d{3})*\.\d{2}')
+
+
+def find_header(rows):
+    """
+    Baris header pertama yang memuat Teller, Debet, Kredit dan Saldo
+    dengan urutan kiri ke kanan: (columns {nama: [x0, x1]}, bottom baris)
+    (None, None) jika tidak ada baris seperti itu
+    """
+    for row in rows:
+        columns = {}
+        for word in row:
+            name = HEADER_WORDS.get(word['text'])
+            if name and name not in columns:
+                columns[name] = [word['x0'], word['x1']]
+
+        if len(columns) == len(COLUMN_ORDER):
+            x0s = [columns[name][0] for name in COLUMN_ORDER]
+            if x0s == sorted(x0s):
+                return columns, max(word['bottom'] for word in row)
+    return None, None
+
+
+def header_columns(rows):
+    """Posisi header Teller, Debet, Kredit dan Saldo, atau None"""
+    return find_header(rows)[0]
+
+
+def same_columns(columns, template_columns):
+    """Posisi header Teller, Debet, Kredit dan Saldo sama dengan template (selisih <= LAYOUT_TOLERANCE)"""
+    return all(
+        abs(a - b) <= LAYOUT_TOLERANCE
+        for name in COLUMN_ORDER for a, b in zip(columns[name], template_columns[name])
+    )
+
+
+def header_marks(words):
+    """
+    Kata penanda (text, x0, top) di atas tanggal transaksi pertama (tanggal di
+    awal baris, bukan mis. Periode Transaksi); semua jika tidak ada transaksi
+    """
+    line_start = {}
+    for w in words:
+        top = round(w['top'])
+        line_start[top] = min(line_start.get(top, w['x0']), w['x0'])
+    body_top = min(
+        (w['top'] for w in words if DATE_WORD.fullmatch(w['text']) and w['x0'] <= line_start[round(w['top'])]),
+        default=None,
+    )
+    return [
+        (w['text'], w['x0'], w['top']) for w in words
+        if w['text'] in LAYOUT_MARKS and (body_top is None or w['top'] < body_top)
+    ]
+
+
+def column_boundaries(columns):
+    """
+    Batas kiri kolom teller, debet, kredit, saldo (urut naik)
+    Kolom angka rata kanan, jadi batasnya di tengah celah antar header
+    """
+    boundaries = [columns['teller'][0] - TELLER_MARGIN]
+    for left, right in zip(COLUMN_ORDER, COLUMN_ORDER[1:]):
+        boundaries.append((columns[left][1] + columns[right][0]) / 2)
+    return boundaries
+
+
+def read_layout(page):
+    """
+    Template layout halaman pertama: {columns, boundaries, body_top}
+    Sidik jari cukup dari posisi kata penanda, jadi file dengan layout yang
+    sudah dikenal tidak perlu mengelompokkan baris untuk mencari header.
+    body_top: bawah baris header; kata di atasnya (info rekening dan header)
+    dilewati saat parse halaman pertama. None jika header tidak ditemukan
+    """
+    words = page.extract_words()
+    key = fingerprint(page, header_marks(words))
+    store = layout_store()
+    template = store.get(NAME, VERSION, key)
+    if template is None:
+        columns, bottom = find_header(group_rows(words))
+        if columns is None:
+            return None
+        template = {'columns': columns, 'boundaries': column_boundaries(columns), 'body_top': bottom}
+        store.put(NAME, VERSION, key, template)
+    return template
+
+
+def bin_row(words, boundaries):
+    """Isi 5 sel (tanggal+uraian, teller, debet, kredit, saldo) berdasarkan x tengah kata"""
+    cells = [[] for _ in range(len(boundaries) + 1)]
+    for word in sorted(words, key=lambda w: w['x0']):
+        cells[bisect_right(boundaries, (word['x0'] + word['x1']) / 2)].append(word['text'])
+    return [' '.join(cell) for cell in cells]
+
+
+def parse_binned_row(cells):
+    """Ubah sel hasil bin_row menjadi [tanggal, uraian, teller, debet, kredit, saldo]"""
+    left, teller, debet, kredit, saldo = cells
+
+    # Header dan baris lanjutan (tanpa tanggal) dilewati seperti parse_row
+    if 'Tanggal Transaksi' in left or 'Transaction Date' in left:
+        return None
+    date_match = DATE_PREFIX.match(left)
+    if not date_match:
+        return None
+
+    if not AMOUNT.fullmatch(saldo):
+        return None
+    if (debet and not AMOUNT.fullmatch(debet)) or (kredit and not AMOUNT.fullmatch(kredit)):
+        return None
+
+    return [
+        date_match.group(1),
+        left[date_match.end():].strip(),
+        teller,
+        '' if debet == '0.00' else debet,
+        '' if kredit == '0.00' else kredit,
+        saldo,
+    ]
+
+
+def column_rows(rows, boundaries):
+    """Baris transaksi dari baris kata satu halaman dengan batas kolom tetap"""
+    page_data = []
+    for row_words in rows:
+        parsed = parse_binned_row(bin_row(row_words, boundaries))
+        if parsed:
+            page_data.append(parsed)
+    return page_data
+
+
+def parse_row(row):
+    """Ubah satu baris tabel menjadi [tanggal, uraian, teller, debet, kredit, saldo]"""
+    row_text = ' '.join([str(c) if c else '' for c in row])
+
+    # Skip header
+    if 'Tanggal Transaksi' in row_text or 'Transaction Date' in row_text:
+        return None
+    if 'Debet' in row_text and 'Kredit' in row_text and 'Saldo' in row_text:
+        return None
+
+    date_match = re.search(r'(\d{2}/\d{2}/\d{2,4}(?:\s+\d{2}:\d{2}:\d{2})?)', row_text)
+    if not date_match:
+        return None
+
+    tanggal = date_match.group(1)
+
+    # Cari semua angka (amounts) dalam format: 1,234.56 atau 1234.56
+    amounts = re.findall(r'\d{1,3}(?:,\d{3})*(?:\.\d{2})', row_text)
+
+    if len(amounts) < 1:
+        return None
+
+    # Ambil 3 angka terakhir sebagai Debet, Kredit, Saldo
+    # Atau 1 angka terakhir sebagai Saldo saja
+    if len(amounts) >= 3:
+        debet, kredit, saldo = amounts[-3], amounts[-2], amounts[-1]
+    elif len(amounts) == 2:
+        debet, kredit, saldo = '0.00', amounts[-2], amounts[-1]
+    else:
+        debet, kredit, saldo = '0.00', '0.00', amounts[-1]
+
+    # Extract Uraian - text antara tanggal dan angka pertama
+    rest = row_text.replace(tanggal, '', 1).strip()
+    for amt in amounts:
+        rest = rest.replace(amt, '', 1)
+    rest = re.sub(r'\s+', ' ', rest).strip()
+
+    parts = rest.split()
+
+    # Teller biasanya kode singkat di akhir atau all-caps
+    teller = ''
+    for part in reversed(parts):
+        if part.isupper() and len(part) >= 4:
+            teller = part
+            break
+
+    if teller:
+        uraian_parts = [p for p in parts if p != teller]
+    elif len(parts) > 1:
+        teller = parts[-1]
+        uraian_parts = parts[:-1]
+    else:
+        uraian_parts = parts
+
+    uraian = ' '.join(uraian_parts).strip()
+
+    if debet == '0.00':
+        debet = ''
+    if kredit == '0.00':
+        kredit = ''
+
+    return [tanggal, uraian, teller, debet, kredit, saldo]
+
+
+def table_rows(page):
+    """Cara lama: extract_tables() strategi text lalu parse_row"""
+    page_data = []
+
+    tables = page.extract_tables({
+        "vertical_strategy": "text",
+        "horizontal_strategy": "text",
+    })
+
+    for table in tables or []:
+        if not table:
+            continue
+
+        for row in table:
+            if not row or len(row) < 6:
+                continue
+
+            parsed = parse_row(row)
+            if parsed:
+                page_data.append(parsed)
+
+    return page_data
+
+
+def parse_page(page, state):
+    """
+    Ambil baris transaksi dari satu halaman
+    Posisi kolom dari template layout halaman pertama jika header halaman ini
+    sama (atau tidak ada), dari header halaman ini, atau dari header halaman pertama
+    """
+    words = page.extract_words()
+    layout = state.get('layout')
+    if layout is not None and page.page_number == 1:
+        PAGE_PATHS['layout'] += 1
+        return column_rows(group_rows([w for w in words if w['top'] >= layout['body_top']]), layout['boundaries'])
+
+    rows = group_rows(words)
+    columns = header_columns(rows)
+    if layout is not None and (columns is None or same_columns(columns, layout['columns'])):
+        PAGE_PATHS['layout'] += 1
+        return column_rows(rows, layout['boundaries'])
+
+    columns = columns or state.get('columns')
+
+    if columns is None:
+        PAGE_PATHS['tables'] += 1
+        return table_rows(page)
+
+    PAGE_PATHS['columns'] += 1
+    return column_rows(rows, column_boundaries(columns))
+
+
+def finalize_rows(rows, info):
+    """Bersihkan text, format angka dan tambahkan ke total Debet/Kredit; sen-nya ikut di Records.amounts"""
+    n = len(rows)
+    # Debet, Kredit dan Saldo dikonversi dalam satu panggilan; 0.00 menjadi kosong
+    amounts, cents, valid = convert_amounts(
+        [row[3] for row in rows] + [row[4] for row in rows] + [row[5] for row in rows],
+        decimal_comma=False, zero_as_blank=True,
+    )
+
+    # Total dihitung dari sen (int), bukan dari string yang sudah diformat
+    info['Total_Debet'] = info.get('Total_Debet', 0) + int(cents[:n].sum())
+    info['Total_Kredit'] = info.get('Total_Kredit', 0) + int(cents[n:2 * n].sum())
+
+    return Records([
+        Transaction(
+            tanggal, clean_text(uraian), clean_text(teller),
+            amounts[i], amounts[n + i], amounts[2 * n + i],
+        )
+        for i, (tanggal, uraian, teller, _, _, _) in enumerate(rows)
+    ], {name: (cents[k * n:(k + 1) * n], valid[k * n:(k + 1) * n]) for k, name in enumerate(COLUMNS[3:6])})
+
+
+def finish_info(info, total):
+    """Format total Debet/Kredit ke format Indonesia"""
+    for key in ['Total_Debet', 'Total_Kredit']:
+        info[key] = format_cents([info.get(key, 0)])[0]
+
+
+def info_rows(info, total):
+    """Isi sheet Info"""
+    return [
+        ['Nama Rekening', info.get('Nama', '')],
+        ['No. Rekening', info.get('No_Rekening', '')],
+        ['Periode', info.get('Periode', '')],
+        ['Produk', info.get('Produk', '')],
+        ['Total Debet', info.get('Total_Debet', '')],
+        ['Total Kredit', info.get('Total_Kredit', '')],
+        ['Total Transaksi', f"{total:,}"],
+    ]
@@ -0,0 +1,282 @@
+"""Format 4 - rekening koran BCA (baris transaksi diawali DD/MM)."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import namedtuple
+
+from ..common import Records, group_rows, page_text, stitch_rows
+from ..numbers import format_cents, parse_amounts, parse_cents
+
+logger = logging.getLogger(__name__)
+
+NAME = 'format_4'
+BASE_VERSION = 8
+# BASE_VERSION, ditambah hash kode transaksi tambahan jika ada (lihat use_transaction_types)
+VERSION = BASE_VERSION
+OUTPUT_NAME = 'BCA_Rekening_Koran'
+
+COLUMNS = ['Tanggal', 'Tipe Transaksi', 'Keterangan', 'Debit', 'Kredit', 'Saldo']
+OUTPUT_COLUMNS = COLUMNS
+
+# Tipe kolom untuk output parquet/arrow; kolom lain string
+COLUMN_TYPES = {
+    'Tanggal': ('date', ['%d/%m/%Y']),
+    'Debit': 'decimal', 'Kredit': 'decimal', 'Saldo': 'decimal',
+}
+
+# Output database: kolom tanggal, uraian, debit, kredit, saldo; nomor rekening belum dibaca dari PDF
+DB_COLUMNS = ('Tanggal', 'Keterangan', 'Debit', 'Kredit', 'Saldo')
+ACCOUNT_INFO = None
+# Saldo dari PDF untuk rekonsiliasi (kunci info); total mutasi belum dibaca
+BALANCE_INFO = {'opening': 'Saldo_Awal'}
+
+Transaction = namedtuple('Transaction', ['tanggal', 'tipe', 'keterangan', 'debit', 'kredit', 'saldo'])
+
+INFO_SHEET = 'Ringkasan'
+INFO_HEADER = ['Keterangan', 'Nilai']
+DATA_SHEET = 'Detail Transaksi'
+# Lebar kolom XLSX disesuaikan dengan isi
+AUTO_WIDTH = True
+
+# Script Colab BCA tidak membuang duplikat
+DEDUPLICATE = False
+
+# Penanda untuk deteksi format otomatis: (regex, bobot)
+SIGNATURES = [
+    (r'^\d{2}/\d{2}\s+(?!\d)', 2),
+    (r'TRSF E-BANKING|BI-FAST|SWITCHING', 3),
+    (r'\bMUTASI\b', 1),
+    (r'\bCBG\b', 1),
+    (r'\bBCA\b', 1),
+]
+
+YEAR = '2025'
+
+# Baris saldo awal BCA, mis. '01/12 SALDO AWAL 645,447,905.64'; bukan transaksi
+SALDO_AWAL = re.compile(r'SALDO AWAL\s*:?\s*([\d,]+\.\d{2})')
+
+# Baris transaksi diawali tanggal DD/MM
+DATE_START = re.compile(r'\d{2}/\d{2}\s+')
+# Nominal 1,234.56; nominal pertama sampai akhir baris; kode CBG di awal keterangan
+NUMBER = re.compile(r'([\d,]+\.\d{2})')
+AMOUNTS_TAIL = re.compile(r'\s+[\d,]+\.\d{2}.*$')
+CBG_CODE = re.compile(r'^\s*\d+\s+')
+# Baris yang menutup transaksi terakhir: header tabel, ringkasan mutasi,
+# 'LABEL : nilai' dan keterangan halaman
+NOT_DESCRIPTION = re.compile(
+    r'TANGGAL\b|SALDO AKHIR|MUTASI\s+(?:CR|DB)\b|Bersambung|[A-Za-z][\w .]*\s:', re.IGNORECASE,
+)
+
+# Kode transaksi BCA: (kata kunci, Tipe Transaksi, arah mutasi). Arah 'DB'/'CR'
+# dari kodenya; None = ikut penanda DB setelah nominal. Jika satu baris berisi
+# beberapa kode, yang lebih dulu di table menang. Kode baru ditambah di sini
+# (naikkan BASE_VERSION supaya cache baris mentah tidak dipakai) atau tanpa
+# mengubah kode lewat file JSON di TYPES_ENV / --bca-types
+TRANSACTION_TYPES = [
+    ('TRSF E-BANKING CR', 'Transfer E-Banking (Kredit)', 'CR'),
+    ('TRSF E-BANKING DB', 'Transfer E-Banking (Debit)', 'DB'),
+    ('BI-FAST CR', 'BI-FAST (Kredit)', 'CR'),
+    ('BI-FAST DB', 'BI-FAST (Debit)', 'DB'),
+    ('SWITCHING CR', 'Switching (Kredit)', 'CR'),
+    ('BIAYA ADM', 'Biaya Admin', None),
+    ('PAJAK BUNGA', 'Pajak Bunga', None),
+    ('BUNGA', 'Bunga', None),
+]
+
+# Path file JSON kode transaksi tambahan, dibaca saat modul di-import (juga di worker):
+# {"KATA KUNCI": ["Tipe Transaksi", "DB" | "CR" | null], ...}
+TYPES_ENV = 'REKENING_KORAN_BCA_TYPES'
+
+
+def compile_types(table):
+    """
+    Satu regex alternation untuk semua kata kunci table
+    Kata kunci terpanjang dicoba duluan, jadi 'PAJAK BUNGA' tidak terbaca 'BUNGA';
+    satu group supaya split mengembalikan kata kuncinya
+    Return: (regex, {kata kunci: (urutan di table, tipe, arah)})
+    """
+    keywords = sorted((keyword for keyword, _, _ in table), key=len, reverse=True)
+    pattern = re.compile('(' + '|'.join(re.escape(keyword) for keyword in keywords) + ')')
+    return pattern, {keyword: (rank, label, direction) for rank, (keyword, label, direction) in enumerate(table)}
+
+
+def load_transaction_types(path):
+    """Baca kode transaksi tambahan dari file JSON (lihat TYPES_ENV); return list (kata kunci, tipe, arah)"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, dict):
+        raise ValueError(f"{path}: isi harus object {{kata kunci: [tipe, arah]}}")
+    table = []
+    for keyword, value in entries.items():
+        if isinstance(value, str):
+            value = [value]
+        label, direction = (value + [None])[:2] if isinstance(value, list) and 1 <= len(value) <= 2 else (None, None)
+        if not keyword or not isinstance(label, str) or direction not in ('DB', 'CR', None):
+            raise ValueError(f"{path}: kode {keyword!r} tidak valid (arah harus DB, CR atau null)")
+        table.append((keyword, label, direction))
+    return table
+
+
+def use_transaction_types(extra):
+    """
+    Gabungkan kode tambahan dengan TRANSACTION_TYPES lalu compile ulang
+    Kata kunci yang sudah ada diganti di tempatnya, yang baru ditaruh di akhir table;
+    VERSION ikut berubah supaya baris mentah di cache tidak tercampur
+    """
+    global TYPE_PATTERN, TYPES, VERSION
+    merged = {keyword: (keyword, label, direction) for keyword, label, direction in TRANSACTION_TYPES}
+    merged.update((keyword, (keyword, label, direction)) for keyword, label, direction in extra)
+    TYPE_PATTERN, TYPES = compile_types(list(merged.values()))
+    if extra:
+        digest = hashlib.sha256(json.dumps(sorted(extra)).encode()).hexdigest()[:12]
+        VERSION = f'{BASE_VERSION}+{digest}'
+    else:
+        VERSION = BASE_VERSION
+
+
+TYPE_PATTERN, TYPES = compile_types(TRANSACTION_TYPES)
+if os.environ.get(TYPES_ENV):
+    use_transaction_types(load_transaction_types(os.environ[TYPES_ENV]))
+
+
+def classify(line):
+    """
+    Kode transaksi di baris dalam satu scan: (tipe, arah, baris tanpa semua kode),
+    atau None jika tidak dikenal
+    """
+    parts = TYPE_PATTERN.split(line)
+    if len(parts) == 1:
+        return None
+    if len(parts) == 3:
+        _, label, direction = TYPES[parts[1]]
+    else:
+        _, label, direction = min(TYPES[keyword] for keyword in parts[1::2])
+    return label, direction, ''.join(parts[::2])
+
+
+def parse_line(line):
+    """
+    Parse satu baris transaksi BCA menjadi list sesuai COLUMNS
+    Debit, Kredit dan Saldo tetap text (1,234.56); kosong jika tidak ada
+    """
+    parts = line.split()
+    date = parts[0]
+
+    # Find all numbers in the line
+    numbers = NUMBER.findall(line)
+
+    # Remove date, then get transaction type; every known code is removed from the description
+    match = DATE_START.match(line)
+    desc = line[match.end():] if match else line
+    direction = None
+    found = classify(desc)
+    if found:
+        trans_type, direction, desc = found
+    else:
+        trans_type = parts[1] if len(parts) > 1 else ''
+
+    # Remove numbers
+    desc = AMOUNTS_TAIL.sub('', desc)
+    desc = CBG_CODE.sub('', desc)  # Remove CBG code
+    desc = desc.strip()
+
+    is_debit = direction == 'DB' if direction else ' DB' in line
+
+    balance = numbers[-1] if numbers else ''
+    amount = numbers[-2] if len(numbers) >= 2 else ''
+
+    return [
+        date + '/' + YEAR,
+        trans_type,
+        desc,
+        amount if is_debit else '',
+        amount if not is_debit else '',
+        balance,
+    ]
+
+
+def read_info(page, state):
+    """Saldo awal (sen) dari baris SALDO AWAL halaman pertama, jika ada"""
+    match = SALDO_AWAL.search(page_text(page))
+    return {'Saldo_Awal': int(parse_cents([match.group(1)], decimal_comma=False)[0])} if match else {}
+
+
+def parse_row(line):
+    """Baris transaksi (diawali DD/MM), atau None"""
+    if not DATE_START.match(line) or 'SALDO AWAL' in line:
+        return None
+    try:
+        return parse_line(line)
+    except Exception:
+        # Baris dilewati; detailnya ke logging, bukan stdout worker
+        logger.warning("Baris BCA dilewati: %.50s...", line, exc_info=True)
+        return None
+
+
+def is_continuation(line):
+    """Sambungan Keterangan (nama, berita transfer) di baris berikutnya (posisinya dicek stitch_rows)"""
+    text = line.strip()
+    return bool(text) and not DATE_START.match(text) and not NOT_DESCRIPTION.match(text)
+
+
+def description_span(words):
+    """Kolom Keterangan baris transaksi: sesudah tanggal sampai sebelum nominal pertama"""
+    x1 = next((word['x0'] for word in words if NUMBER.fullmatch(word['text'])), float('inf'))
+    return words[0]['x1'], x1
+
+
+def parse_page(page, state):
+    """Ambil baris transaksi dari satu halaman; Keterangan yang terpotong disambung"""
+    return stitch_rows(group_rows(page.extract_words()), parse_row, is_continuation, 2, description_span)
+
+
+def format_rupiah(cents, shown):
+    """Format array sen BCA: Rp 1,234.00, kosong jika shown False"""
+    texts = format_cents(cents, thousands=',', decimal='.')
+    return [f'Rp {text}' if show else '' for text, show in zip(texts, shown.tolist())]
+
+
+def finalize_rows(rows, info):
+    """Hitung total (sen, int64) dan format kolom Debit, Kredit, Saldo; sen-nya ikut di Records.amounts"""
+    if not rows:
+        return Records()
+    n = len(rows)
+    cents, valid = parse_amounts(
+        [row[3] for row in rows] + [row[4] for row in rows] + [row[5] for row in rows], decimal_comma=False,
+    )
+    info['Total_Debit'] = info.get('Total_Debit', 0) + int(cents[:n].sum())
+    info['Total_Kredit'] = info.get('Total_Kredit', 0) + int(cents[n:2 * n].sum())
+    info['Saldo_Akhir'] = int(cents[-1])
+
+    # Debit/Kredit nol atau negatif ditampilkan kosong dan null di output bertipe;
+    # Saldo yang ter-parse (termasuk 0) tetap nilai supaya saldo berjalan bisa dicek
+    valid[:2 * n] &= cents[:2 * n] > 0
+    amounts = format_rupiah(cents, valid)
+    return Records([
+        Transaction(tanggal, tipe, keterangan, amounts[i], amounts[n + i], amounts[2 * n + i])
+        for i, (tanggal, tipe, keterangan, _, _, _) in enumerate(rows)
+    ], {name: (cents[k * n:(k + 1) * n], valid[k * n:(k + 1) * n]) for k, name in enumerate(COLUMNS[3:6])})
+
+
+def finish_info(info, total):
+    """Total dan saldo sudah dihitung di finalize_rows"""
+
+
+def rupiah_total(cents):
+    if cents is None:
+        return ''
+    return 'Rp ' + format_cents([cents], thousands=',', decimal='.')[0]
+
+
+def info_rows(info, total):
+    """Isi sheet Ringkasan"""
+    return [
+        ['Saldo Awal', rupiah_total(info.get('Saldo_Awal'))],
+        ['Total Kredit', rupiah_total(info.get('Total_Kredit', 0))],
+        ['Total Debit', rupiah_total(info.get('Total_Debit', 0))],
+        ['Saldo Akhir', rupiah_total(info.get('Saldo_Akhir', 0))],
+        ['Jumlah Transaksi', f'{total} transaksi'],
+    ]
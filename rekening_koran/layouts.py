@@ -0,0 +1,98 @@
+"""Template layout per bank: posisi kolom dan batas header yang sudah dipelajari.
+
+Layout rekening koran satu bank hampir tidak pernah berubah, jadi posisi
+kolom cukup dicari sekali. Template disimpan per parser dan versinya dengan
+kunci sidik jari halaman pertama (ukuran halaman + posisi kata-kata header),
+jadi template dari versi parser lama tidak dipakai lagi; file
+berikutnya dengan sidik jari yang sama langsung memakai template tanpa
+mencari baris header lagi.
+
+Tanpa folder, template hanya disimpan di memori proses (tetap berguna untuk
+banyak file dalam satu worker). Dengan folder (--cache), template disimpan di
+SQLite dan dipakai bersama oleh semua proses dan run berikutnya.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+LAYOUT_FILE = 'layouts.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS layouts (
+    parser TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    template TEXT NOT NULL,
+    PRIMARY KEY (parser, fingerprint)
+);
+"""
+
+
+def fingerprint(page, marks):
+    """Sidik jari layout: ukuran halaman + kata penanda (text, x0, top) dibulatkan ke 1pt"""
+    key = (round(page.width), round(page.height), sorted((text, round(x0), round(top)) for text, x0, top in marks))
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+
+def parser_key(parser_name, version):
+    """Kunci parser template: nama + versi parser, seperti cache_key"""
+    return f"{parser_name}:{version}"
+
+
+class LayoutStore:
+    """Template layout {(parser, versi, fingerprint): template}, opsional disimpan di SQLite"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.templates = {}
+        self.db = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.db = sqlite3.connect(os.path.join(cache_dir, LAYOUT_FILE), timeout=60, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.executescript(_SCHEMA)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+
+    def get(self, parser_name, version, key):
+        """Template untuk sidik jari ini dari versi parser yang sama, atau None"""
+        if (parser_name, version, key) in self.templates:
+            return self.templates[parser_name, version, key]
+        if self.db is None:
+            return None
+
+        row = self.db.execute(
+            'SELECT template FROM layouts WHERE parser = ? AND fingerprint = ?', (parser_key(parser_name, version), key)
+        ).fetchone()
+        if row is None:
+            return None
+        template = self.templates[parser_name, version, key] = json.loads(row[0])
+        return template
+
+    def put(self, parser_name, version, key, template):
+        self.templates[parser_name, version, key] = template
+        if self.db is not None:
+            self.db.execute(
+                'INSERT OR REPLACE INTO layouts VALUES (?, ?, ?)',
+                (parser_key(parser_name, version), key, json.dumps(template)),
+            )
+
+
+_store = LayoutStore()
+
+
+def layout_store():
+    """LayoutStore yang dipakai parser di proses ini"""
+    return _store
+
+
+def use_layout_dir(cache_dir):
+    """Simpan template di cache_dir (None: hanya di memori); tidak berubah jika sudah sama"""
+    global _store
+    if _store.cache_dir != cache_dir:
+        _store.close()
+        _store = LayoutStore(cache_dir)
+    return _store
@@ -0,0 +1,329 @@
+"""Waktu dan memori per tahap konversi, per halaman.
+
+Tahap yang diukur:
+
+- detect : deteksi format (di luar layout/text halaman pertama)
+- info   : read_info halaman pertama
+- layout : interpretasi content stream oleh pdfminer, sekali per halaman
+- text   : pengelompokan karakter menjadi kata (extract_text/extract_words)
+- tables : extract_tables
+- parse  : parse_page di luar layout/text/tables (termasuk lookup cache)
+- clean  : buang baris kosong dan duplikat
+- format : finalize_rows
+- check  : cek saldo berjalan (reconcile.Reconciler)
+- write  : buka, tulis dan tutup sink
+
+Waktu bersifat eksklusif: text yang dipanggil dari dalam parse_page tidak
+dihitung lagi sebagai parse. Dengan page_workers, waktu tahap dari semua
+worker dijumlahkan (waktu CPU, bisa melebihi waktu total file). Pengukuran hanya aktif di dalam ``collect()``;
+di luar itu ``stage()`` tidak melakukan apa-apa.
+
+convert_file mengumpulkan hasilnya per file (``result['metrics']``) dan
+proses utama menulisnya lewat ``MetricsWriter``: JSON lines (satu baris per
+halaman dan per file) atau teks Prometheus jika path berakhiran ``.prom``.
+"""
+
+import cProfile
+import json
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+STAGES = ('detect', 'info', 'layout', 'text', 'tables', 'parse', 'clean', 'format', 'check', 'write')
+PROFILES = ('cprofile', 'tracemalloc')
+
+# Batas bucket histogram waktu per halaman (detik)
+PAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL = nullcontext()
+
+
+class Metrics:
+    """
+    Waktu per tahap dan per halaman untuk satu file
+    profile: None, 'cprofile' (satu profil per tahap) atau 'tracemalloc'
+    (puncak alokasi Python per tahap)
+    """
+
+    def __init__(self, profile=None, prefix=None):
+        self.profile = profile
+        self.prefix = prefix
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        # nomor halaman -> {'rows': n, 'seconds': {tahap: detik}}
+        self.pages = {}
+        # tahap -> puncak alokasi tracemalloc (byte)
+        self.memory = {}
+        self.profilers = {}
+        self.profile_paths = []
+        self.peak_rss = 0
+        # [tahap, detik tahap anak, profiler, puncak memori sebelum tahap anak]
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name, page_num=None):
+        parent = self._stack[-1] if self._stack else None
+        profiler = None
+        if self.profile == 'cprofile':
+            if parent is not None:
+                parent[2].disable()
+            profiler = self.profilers.get(name) or self.profilers.setdefault(name, cProfile.Profile())
+            profiler.enable()
+        elif self.profile == 'tracemalloc':
+            if parent is not None:
+                parent[3] = max(parent[3], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0] if self.profile == 'tracemalloc' else 0
+
+        frame = [name, 0.0, profiler, 0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self.add(name, elapsed - frame[1], page_num)
+
+            if profiler is not None:
+                profiler.disable()
+                if parent is not None:
+                    parent[2].enable()
+            elif self.profile == 'tracemalloc':
+                peak = max(frame[3], tracemalloc.get_traced_memory()[1])
+                self.memory[name] = max(self.memory.get(name, 0), peak - base)
+                if parent is not None:
+                    parent[3] = max(parent[3], peak)
+                    tracemalloc.reset_peak()
+            if parent is not None:
+                parent[1] += elapsed
+
+    def add(self, name, seconds, page_num=None):
+        self.stages[name] += seconds
+        if page_num is not None:
+            page_stages = self.page(page_num)['seconds']
+            page_stages[name] = page_stages.get(name, 0.0) + seconds
+
+    def page(self, page_num):
+        return self.pages.setdefault(page_num, {'rows': 0, 'seconds': {}})
+
+    def add_rows(self, page_num, count):
+        self.page(page_num)['rows'] += count
+
+    def export(self):
+        """Hasil yang bisa di-pickle, untuk digabung dari worker ekstraksi paralel"""
+        self.dump_profiles()
+        return {
+            'stages': self.stages, 'pages': self.pages, 'memory': self.memory,
+            'profiles': self.profile_paths, 'peak_rss_bytes': max_rss(),
+        }
+
+    def merge(self, exported):
+        for name, seconds in exported['stages'].items():
+            self.stages[name] += seconds
+        for page_num, values in exported['pages'].items():
+            page = self.page(page_num)
+            page['rows'] += values['rows']
+            for name, seconds in values['seconds'].items():
+                page['seconds'][name] = page['seconds'].get(name, 0.0) + seconds
+        for name, peak in exported['memory'].items():
+            self.memory[name] = max(self.memory.get(name, 0), peak)
+        self.profile_paths.extend(exported['profiles'])
+        self.peak_rss = max(self.peak_rss, exported['peak_rss_bytes'])
+
+    def dump_profiles(self):
+        """Simpan profil cProfile per tahap ke PREFIX.TAHAP.prof (dibaca dengan pstats/snakeviz)"""
+        if not self.profilers or not self.prefix:
+            return
+        os.makedirs(os.path.dirname(self.prefix) or '.', exist_ok=True)
+        for name, profiler in self.profilers.items():
+            path = f"{self.prefix}.{name}.prof"
+            profiler.dump_stats(path)
+            self.profile_paths.append(path)
+        self.profilers.clear()
+
+    def report(self):
+        """Dict untuk result['metrics'] (bisa di-JSON)"""
+        self.dump_profiles()
+        report = {
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items() if seconds},
+            'pages': [
+                {'page': page_num, 'rows': values['rows'],
+                 'seconds': {name: round(seconds, 6) for name, seconds in values['seconds'].items()}}
+                for page_num, values in sorted(self.pages.items())
+            ],
+            # Puncak RSS proses ini (dan worker ekstraksi), sejak proses mulai
+            'peak_rss_bytes': max(self.peak_rss, max_rss()),
+        }
+        if self.memory:
+            report['memory'] = self.memory
+        if self.profile_paths:
+            report['profiles'] = self.profile_paths
+        return report
+
+
+def max_rss():
+    # ru_maxrss dalam KiB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# Metrics yang sedang dikumpulkan di proses ini
+_current = None
+
+
+@contextmanager
+def collect(profile=None, prefix=None):
+    """
+    Aktifkan pengukuran selama blok with; yield Metrics
+    prefix: awalan path file profil cProfile
+    """
+    global _current
+    if profile not in (None, *PROFILES):
+        raise ValueError(f"Profile tidak dikenal: {profile}")
+    previous = _current
+    _current = metrics = Metrics(profile, prefix)
+    started = profile == 'tracemalloc' and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield metrics
+    finally:
+        _current = previous
+        if started:
+            tracemalloc.stop()
+
+
+def current():
+    """Metrics yang sedang aktif, atau None"""
+    return _current
+
+
+def stage(name, page_num=None):
+    """Context manager pengukur satu tahap; tidak melakukan apa-apa di luar collect()"""
+    if _current is None:
+        return _NULL
+    return _current.stage(name, page_num)
+
+
+def add_rows(page_num, count):
+    if _current is not None:
+        _current.add_rows(page_num, count)
+
+
+def page_seconds(page):
+    return sum(page['seconds'].values())
+
+
+# ============================================================
+# OUTPUT
+# ============================================================
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PrometheusMetrics:
+    """Akumulasi result['metrics'] semua file menjadi teks format Prometheus"""
+
+    def __init__(self):
+        self.files = {}
+        self.pages = {}
+        self.rows = {}
+        self.stages = {}
+        # format -> hitungan halaman per bucket (kumulatif saat render), jumlah detik
+        self.page_buckets = {}
+        self.page_sum = {}
+        self.peak_rss = 0
+
+    def add(self, result):
+        format_name = result.get('format') or 'unknown'
+        key = (format_name, result.get('status', 'error'))
+        self.files[key] = self.files.get(key, 0) + 1
+        metrics = result.get('metrics')
+        if not metrics:
+            return
+
+        self.pages[format_name] = self.pages.get(format_name, 0) + len(metrics['pages'])
+        self.rows[format_name] = self.rows.get(format_name, 0) + (result.get('rows') or 0)
+        for name, seconds in metrics['stages'].items():
+            self.stages[format_name, name] = self.stages.get((format_name, name), 0.0) + seconds
+        buckets = self.page_buckets.setdefault(format_name, [0] * (len(PAGE_BUCKETS) + 1))
+        for page in metrics['pages']:
+            seconds = page_seconds(page)
+            index = next((i for i, bound in enumerate(PAGE_BUCKETS) if seconds <= bound), len(PAGE_BUCKETS))
+            buckets[index] += 1
+            self.page_sum[format_name] = self.page_sum.get(format_name, 0.0) + seconds
+        self.peak_rss = max(self.peak_rss, metrics['peak_rss_bytes'])
+
+    def render(self):
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            """samples: [(akhiran nama, label, nilai)]"""
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{suffix}{{{label_text}}} {value}" if label_text else f"{name}{suffix} {value}")
+
+        metric('rekening_koran_files_total', 'counter', 'File yang dikonversi per format dan status',
+               [('', {'format': f, 'status': s}, n) for (f, s), n in sorted(self.files.items())])
+        metric('rekening_koran_pages_total', 'counter', 'Halaman yang dikonversi',
+               [('', {'format': f}, n) for f, n in sorted(self.pages.items())])
+        metric('rekening_koran_rows_total', 'counter', 'Baris transaksi yang dihasilkan',
+               [('', {'format': f}, n) for f, n in sorted(self.rows.items())])
+        metric('rekening_koran_stage_seconds_total', 'counter', 'Waktu per tahap konversi (eksklusif)',
+               [('', {'format': f, 'stage': s}, round(v, 6)) for (f, s), v in sorted(self.stages.items())])
+
+        samples = []
+        for format_name, buckets in sorted(self.page_buckets.items()):
+            total = 0
+            for bound, count in zip((*PAGE_BUCKETS, '+Inf'), buckets):
+                total += count
+                samples.append(('_bucket', {'format': format_name, 'le': bound}, total))
+            samples.append(('_sum', {'format': format_name}, round(self.page_sum.get(format_name, 0.0), 6)))
+            samples.append(('_count', {'format': format_name}, total))
+        metric('rekening_koran_page_seconds', 'histogram', 'Waktu per halaman', samples)
+
+        metric('rekening_koran_peak_rss_bytes', 'gauge', 'Puncak RSS proses konversi', [('', {}, self.peak_rss)])
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsWriter:
+    """
+    Tulis result['metrics'] setiap file ke path
+    .prom: teks Prometheus (akumulasi, file diganti atomik setiap ada hasil,
+    cocok untuk textfile collector node_exporter); selain itu JSON lines
+    (ditambahkan ke file)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.prometheus = PrometheusMetrics() if path.endswith('.prom') else None
+
+    def write(self, result):
+        if self.prometheus is not None:
+            self.prometheus.add(result)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus.render())
+            os.replace(tmp_path, self.path)
+            return
+
+        metrics = result.get('metrics')
+        if not metrics:
+            return
+        base = {'file': result['file'], 'format': result['format']}
+        lines = [{'event': 'page', **base, **page} for page in metrics['pages']]
+        slowest = max(metrics['pages'], key=page_seconds, default=None)
+        lines.append({
+            'event': 'file', **base, 'status': result['status'], 'pages': result['pages'], 'rows': result['rows'],
+            'seconds': result['seconds'],
+            **{key: value for key, value in metrics.items() if key != 'pages'},
+            # Waktu di luar tahap yang diukur (buka file, cache ...); 0 jika tahap
+            # berjalan paralel di worker ekstraksi dan jumlahnya melebihi waktu total
+            'other': round(max(0.0, result['seconds'] - sum(metrics['stages'].values())), 6),
+            'slowest_page': slowest['page'] if slowest else None,
+        })
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in lines))
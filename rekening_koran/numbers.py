@@ -0,0 +1,256 @@
+"""Parse dan format angka rekening koran per kolom dengan NumPy.
+
+Satu kolom string (1,234.56 / 1.234,56 / 222,432) diubah sekaligus menjadi
+sen (int64) lewat operasi array pada matriks kode karakter, lalu diformat
+ke format Indonesia 222.432,00. Sen adalah representasi nominal bersama:
+total dan saldo dihitung dari array sen (parse_cents), bukan float. Nilai yang tidak bisa dipastikan dengan
+cara cepat (lebih dari 2 desimal, separator ganda, tanda minus di tengah)
+diproses satu per satu dengan algoritma convert_to_indonesian_format dari
+script Colab, sehingga hasilnya selalu sama dengan jalur cepat.
+
+Beda dengan script Colab: jika ada koma dan titik sekaligus, separator
+terakhir dianggap desimal, jadi 1.234,56 dibaca 1234,56 (dulu 1,23).
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+_NON_NUMERIC = re.compile(r'[^\d,.-]')
+
+# 10^0 .. 10^18 untuk bobot digit
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+# Digit bagian bulat maksimum supaya sen tetap muat di int64
+MAX_INT_DIGITS = 16
+MAX_AMOUNT = 10 ** MAX_INT_DIGITS
+
+_DIGIT_0, _DIGIT_9 = ord('0'), ord('9')
+_COMMA, _DOT, _MINUS = ord(','), ord('.'), ord('-')
+
+
+def _as_text(value):
+    if isinstance(value, str):
+        return value
+    if value is None or pd.isna(value):
+        return ''
+    return str(value)
+
+
+def _convert_one(value, decimal_comma, zero_as_blank):
+    """Algoritma lama per nilai; return (text, sen), sen None jika kosong atau bukan angka"""
+    value_str = _NON_NUMERIC.sub('', value)
+
+    if not value_str or value_str == '-' or (zero_as_blank and value_str == '0.00'):
+        return '', None
+
+    if ',' in value_str and '.' in value_str:
+        # Separator terakhir adalah desimal: 1,234.56 (US) atau 1.234,56 (ID)
+        if value_str.rindex(',') > value_str.rindex('.'):
+            value_str = value_str.replace('.', '').replace(',', '.')
+        else:
+            value_str = value_str.replace(',', '')
+    elif ',' in value_str and decimal_comma and value_str.index(',') == len(value_str) - 3:
+        value_str = value_str.replace('.', '').replace(',', '.')
+    else:
+        value_str = value_str.replace(',', '')
+
+    try:
+        number = float(value_str)
+    except ValueError:
+        return value_str, None
+
+    formatted = f"{number:,.2f}".replace(',', 'TEMP').replace('.', ',').replace('TEMP', '.')
+    # Angka di luar jangkauan int64 tidak mungkin nominal rekening; tidak ikut total
+    return formatted, int(round(number * 100)) if abs(number) < MAX_AMOUNT else None
+
+
+def format_cents(cents, negative=None, thousands='.', decimal=','):
+    """
+    Format array sen (int64) ke 222.432,00 sekaligus
+    negative menandai nilai negatif, termasuk -0,00 seperti float('-0')
+    thousands/decimal: separator, mis. ',' dan '.' untuk 222,432.00
+    """
+    cents = np.asarray(cents, dtype=np.int64)
+    n = len(cents)
+    if n == 0:
+        return []
+    if negative is None:
+        negative = cents < 0
+
+    whole, fraction = np.divmod(np.abs(cents), 100)
+    n_digits = np.ones(n, dtype=np.int64)
+    for k in range(1, 19):
+        n_digits += whole >= _POW10[k]
+    max_digits = int(n_digits.max())
+
+    # Posisi dari kanan: [0,1] pecahan, 2 koma, digit ke-k di 3 + k + k // 3
+    length = 3 + n_digits + (n_digits - 1) // 3 + negative
+    width = int(length.max())
+    out = np.zeros((n, width), dtype=np.uint32)
+    rows = np.arange(n)
+    last = length - 1
+
+    out[rows, last] = _DIGIT_0 + fraction % 10
+    out[rows, last - 1] = _DIGIT_0 + fraction // 10
+    out[rows, last - 2] = ord(decimal)
+    for k in range(max_digits):
+        has = n_digits > k
+        idx = rows[has]
+        right = 3 + k + k // 3
+        out[idx, last[has] - right] = _DIGIT_0 + (whole[has] // _POW10[k]) % 10
+        if k and k % 3 == 0:
+            out[idx, last[has] - right + 1] = ord(thousands)
+    out[rows[negative], 0] = _MINUS
+
+    return out.view(f'U{width}').ravel().tolist()
+
+
+def _text_list(values):
+    return [value if value.__class__ is str else _as_text(value) for value in values]
+
+
+def _scan(texts, decimal_comma):
+    """
+    Baca kolom text sekaligus
+    Return: (sen int64, negative, fast, blank, zero) per nilai; fast False berarti
+    nilai harus diproses _convert_one, zero menandai text '0.00' persis
+    """
+    n = len(texts)
+    # Matriks kode karakter (n x lebar), sisa diisi 0
+    chars = np.array(texts, dtype=str)
+    width = max(chars.dtype.itemsize // 4, 1)
+    m = chars.view(np.uint32).reshape(n, width)
+
+    digit = (m >= _DIGIT_0) & (m <= _DIGIT_9)
+    comma = m == _COMMA
+    dot = m == _DOT
+    minus = m == _MINUS
+    allowed = digit | comma | dot | minus
+
+    # Posisi setiap karakter di string yang sudah dibersihkan
+    pos = np.cumsum(allowed, axis=1, dtype=np.int32) - 1
+    length = allowed.sum(axis=1)
+    n_comma = comma.sum(axis=1)
+    n_dot = dot.sum(axis=1)
+    n_minus = minus.sum(axis=1)
+    rows = np.arange(n)
+
+    first_comma_pos = np.where(n_comma > 0, pos[rows, comma.argmax(axis=1)], -1)
+    last_comma_col = width - 1 - comma[:, ::-1].argmax(axis=1)
+    last_dot_col = width - 1 - dot[:, ::-1].argmax(axis=1)
+    # Koma dan titik: separator terakhir adalah desimal (1.234,56 vs 1,234.56)
+    comma_decimal = (n_comma > 0) & (n_dot > 0) & (last_comma_col > last_dot_col)
+    if decimal_comma:
+        # Hanya koma: desimal jika koma pertama tepat 3 karakter dari belakang
+        comma_decimal |= (n_comma > 0) & (n_dot == 0) & (first_comma_pos == length - 3)
+
+    sep = np.where(comma_decimal[:, None], comma, dot)
+    has_sep = sep.any(axis=1)
+    sep_col = np.where(has_sep, sep.argmax(axis=1), width)
+    after_sep = np.arange(width)[None, :] > sep_col[:, None]
+
+    frac_digit = digit & after_sep
+    int_digit = digit & ~after_sep
+    n_frac = frac_digit.sum(axis=1)
+    n_int = int_digit.sum(axis=1)
+    minus_first = pos[rows, minus.argmax(axis=1)] == 0
+
+    # Karakter non-ASCII (mis. digit Arab) selalu lewat jalur lambat
+    non_ascii = (m > 127).any(axis=1)
+    blank = ~non_ascii & ((length == 0) | ((length == 1) & (n_minus == 1)))
+    fast = (
+        ~blank
+        & ~non_ascii
+        & (n_int + n_frac > 0)
+        & (np.where(comma_decimal, n_comma, n_dot) <= 1)
+        & (n_frac <= 2)
+        & (n_int <= MAX_INT_DIGITS)
+        & ((n_minus == 0) | ((n_minus == 1) & minus_first))
+    )
+
+    # Horner per kolom: semua digit dibaca sebagai satu bilangan bulat
+    # (baris non-fast boleh overflow, nilainya dibuang di bawah)
+    digit_t = np.ascontiguousarray(digit.T)
+    value_t = np.ascontiguousarray((m - _DIGIT_0).astype(np.int8).T)
+    magnitude = np.zeros(n, dtype=np.int64)
+    with np.errstate(over='ignore'):
+        for col in range(width):
+            magnitude = np.where(digit_t[col], magnitude * 10 + value_t[col], magnitude)
+    magnitude *= _POW10[np.clip(2 - n_frac, 0, 2)]
+    negative = n_minus > 0
+    cents = np.where(fast, np.where(negative, -magnitude, magnitude), 0)
+
+    # '0.00' persis: 4 karakter, titik di posisi 1, semua digit nol
+    first_dot_pos = np.where(n_dot > 0, pos[rows, dot.argmax(axis=1)], -1)
+    zero = fast & (length == 4) & (n_dot == 1) & (n_comma == 0) & (n_minus == 0) \
+        & (first_dot_pos == 1) & (magnitude == 0)
+
+    return cents, negative, fast, blank, zero
+
+
+def parse_amounts(values, decimal_comma=True):
+    """
+    Baca satu kolom nominal (1,234.56 / 1.234,56 / Rp 1,234.00) menjadi sen
+    tanpa membuat text; aturan separator sama dengan convert_column
+    Return: (ndarray sen int64, ndarray valid); valid False untuk nilai kosong
+    dan text yang bukan angka (sen-nya 0)
+    """
+    texts = _text_list(values)
+    if not texts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    cents, _, fast, blank, _ = _scan(texts, decimal_comma)
+    valid = fast.copy()
+    for i in np.flatnonzero(~fast & ~blank).tolist():
+        value = _convert_one(texts[i], decimal_comma, False)[1]
+        if value is not None:
+            cents[i] = value
+            valid[i] = True
+    return cents, valid
+
+
+def parse_cents(values, decimal_comma=True):
+    """Seperti parse_amounts, tanpa mask; nilai kosong atau bukan angka bernilai 0"""
+    return parse_amounts(values, decimal_comma)[0]
+
+
+def convert_amounts(values, decimal_comma=True, zero_as_blank=False):
+    """
+    Konversi satu kolom angka ke format Indonesia sekaligus
+    decimal_comma: koma tunggal di posisi -3 dibaca sebagai desimal (format_1/format_2)
+    zero_as_blank: '0.00' menjadi kosong (format_3)
+    Return: (list text, ndarray sen int64, ndarray valid); nilai kosong dan text
+    yang bukan angka (ditulis apa adanya) bernilai 0 sen dengan valid False
+    """
+    texts = _text_list(values)
+    n = len(texts)
+    out = [''] * n
+    if n == 0:
+        return out, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+    cents, negative, fast, blank, zero = _scan(texts, decimal_comma)
+    if zero_as_blank:
+        blank |= zero
+        fast &= ~blank
+
+    if fast.all():
+        out = format_cents(cents, negative)
+    else:
+        fast_idx = np.flatnonzero(fast)
+        for i, text in zip(fast_idx.tolist(), format_cents(cents[fast_idx], negative[fast_idx])):
+            out[i] = text
+
+    valid = fast.copy()
+    for i in np.flatnonzero(~fast & ~blank).tolist():
+        out[i], value = _convert_one(texts[i], decimal_comma, zero_as_blank)
+        if value is not None:
+            cents[i] = value
+            valid[i] = True
+
+    return out, cents, valid
+
+
+def convert_column(values, decimal_comma=True, zero_as_blank=False):
+    """Seperti convert_amounts, tanpa mask valid; return (list text, ndarray sen int64)"""
+    return convert_amounts(values, decimal_comma, zero_as_blank)[:2]
@@ -0,0 +1,133 @@
+"""Halaman PDF yang di-layout sekali untuk semua pembacaan.
+
+pdfplumber menghitung ulang pengelompokan karakter menjadi kata setiap kali
+extract_text() atau extract_words() dipanggil. PageView menyimpan satu
+WordMap per halaman lalu menurunkan kata, text dan baris dari hasil itu,
+sehingga info header, deteksi format dan parse_page memakai hasil yang sama.
+
+Document membuka PDF sekali per proses: jika convert_file sudah membuka
+file untuk deteksi format, ekstraksi memakai Document dan PageView yang sama.
+"""
+
+from contextlib import contextmanager
+from functools import cached_property
+
+import pdfplumber
+from pdfplumber.utils.text import WordExtractor
+
+from .metrics import stage
+
+
+class PageView:
+    """
+    Pembungkus pdfplumber Page dengan hasil ekstraksi yang di-cache
+    Atribut lain (edges, bbox, page_obj, chars ...) diteruskan ke page asli
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._tables = {}
+
+    def __getattr__(self, name):
+        return getattr(self.page, name)
+
+    def load_objects(self):
+        """Objek halaman dari pdfminer; dihitung sekali dan di-cache pdfplumber"""
+        with stage('layout', self.page.page_number):
+            return self.page.objects
+
+    @cached_property
+    def wordmap(self):
+        """Kata beserta karakternya, pengaturan default extract_words()/extract_text()"""
+        self.load_objects()
+        with stage('text', self.page.page_number):
+            return WordExtractor().extract_wordmap(self.page.chars)
+
+    @cached_property
+    def words(self):
+        return [word for word, _ in self.wordmap.tuples]
+
+    @cached_property
+    def text(self):
+        """Sama dengan page.extract_text()"""
+        page = self.page
+        return self.wordmap.to_textmap(
+            layout_bbox=page.bbox, layout_width=page.width, layout_height=page.height, presorted=True,
+        ).as_string
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    def extract_text(self, **kwargs):
+        return self.text if not kwargs else self.page.extract_text(**kwargs)
+
+    def extract_words(self, **kwargs):
+        return self.words if not kwargs else self.page.extract_words(**kwargs)
+
+    def extract_tables(self, table_settings=None):
+        """page.extract_tables(), sekali per pengaturan"""
+        key = repr(sorted((table_settings or {}).items()))
+        if key not in self._tables:
+            self.load_objects()
+            with stage('tables', self.page.page_number):
+                self._tables[key] = self.page.extract_tables(table_settings)
+        return self._tables[key]
+
+    def close(self):
+        """Lepaskan hasil layout halaman ini"""
+        for name in ('wordmap', 'words', 'text', 'lines'):
+            self.__dict__.pop(name, None)
+        self._tables.clear()
+        self.page.close()
+
+
+class Document:
+    """PDF yang sedang dibuka beserta PageView setiap halaman yang sudah dipakai"""
+
+    def __init__(self, pdf_path, pages=None):
+        self.pdf = pdfplumber.open(pdf_path, pages=pages)
+        self.views = {}
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def page(self, index):
+        """PageView halaman ke-index (mulai 0), dibuat sekali"""
+        if index not in self.views:
+            self.views[index] = PageView(self.pdf.pages[index])
+        return self.views[index]
+
+    def release(self, index):
+        """Tutup halaman yang sudah selesai supaya memori tidak menumpuk"""
+        view = self.views.pop(index, None)
+        if view is not None:
+            view.close()
+
+    def close(self):
+        self.views.clear()
+        self.pdf.close()
+
+
+# Document yang sedang dibuka di proses ini, per path
+_OPEN = {}
+
+
+@contextmanager
+def open_pdf(pdf_path):
+    """
+    Buka PDF sebagai Document
+    Jika path yang sama sedang dibuka oleh pemanggil di atasnya (mis. convert_file
+    untuk deteksi format), Document itu dipakai ulang dan tidak ditutup di sini
+    """
+    doc = _OPEN.get(pdf_path)
+    if doc is not None:
+        yield doc
+        return
+
+    doc = _OPEN[pdf_path] = Document(pdf_path)
+    try:
+        yield doc
+    finally:
+        del _OPEN[pdf_path]
+        doc.close()
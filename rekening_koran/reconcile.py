@@ -0,0 +1,177 @@
+"""Cek saldo berjalan hasil konversi: saldo sebelumnya - debit + kredit == saldo.
+
+Reconciler menerima record per halaman seperti sink; semua baris satu
+halaman dicek sekaligus dengan NumPy (sen int64, jadi perbandingannya
+exact). Saldo dan total dari PDF (``BALANCE_INFO`` parser) dicocokkan di
+akhir. Baris yang tidak cocok dicatat beserta selisihnya, misalnya karena
+baris hilang, deskripsi terpecah jadi dua baris, atau DB/CR tertukar.
+Nominal yang tidak terbaca sebagai angka tidak dianggap 0: baris itu tidak
+dicek (dan saldonya tidak dipakai untuk baris berikutnya), lalu dicatat
+terpisah sebagai baris tidak terbaca.
+"""
+
+import numpy as np
+
+from .common import column_amounts
+from .metrics import stage
+from .numbers import format_cents, parse_amounts
+
+# Jumlah baris bermasalah yang dicatat per file
+MAX_ISSUES = 20
+
+HEADER_LABELS = {
+    'opening': 'saldo awal', 'closing': 'saldo akhir', 'debit': 'total debit', 'credit': 'total kredit',
+}
+
+
+def info_cents(value):
+    """Nilai info (sen int, atau text 1,234.56 / 1.234,56) dalam sen; None jika kosong atau bukan angka"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, int):
+        return value
+    cents, valid = parse_amounts([value])
+    return int(cents[0]) if valid[0] else None
+
+
+class Reconciler:
+    """
+    Cek saldo berjalan satu statement
+    Dipakai seperti sink oleh write_statement (write_rows/close/abort), lalu finish(info)
+    """
+
+    path = None
+
+    def __init__(self, parser):
+        columns = getattr(parser, 'DB_COLUMNS', None)
+        self.columns = columns
+        self.indexes = [parser.OUTPUT_COLUMNS.index(name) for name in columns] if columns else None
+        self.balance_info = getattr(parser, 'BALANCE_INFO', None) or {}
+        self.rows = 0
+        self.checked = 0
+        self.breaks = 0
+        self.issues = []
+        # Baris dengan nominal yang tidak terbaca (nomor baris, maksimum MAX_ISSUES)
+        self.unparsed = 0
+        self.unparsed_rows = []
+        self.total_debit = 0
+        self.total_credit = 0
+        # Saldo baris terakhir (sen), None jika kosong
+        self.last_balance = None
+        # (debit, kredit, saldo) baris pertama untuk dicocokkan dengan saldo awal
+        self.first = None
+
+    def write_rows(self, records):
+        if self.indexes is None or not records:
+            return
+        with stage('check'):
+            self.check(records)
+
+    def check(self, records):
+        date_i, desc_i = self.indexes[:2]
+        n = len(records)
+        # Sen dari finalize_rows; debit/kredit kosong berarti 0, tidak terbaca berarti tidak diketahui
+        (debit, debit_ok), (credit, credit_ok), (balance, balance_ok) = [
+            column_amounts(records, index, name) for index, name in zip(self.indexes[2:], self.columns[2:])
+        ]
+        blank = [
+            np.array([record[index] in (None, '') for record in records], dtype=bool) for index in self.indexes[2:]
+        ]
+        unparsed = (~debit_ok & ~blank[0]) | (~credit_ok & ~blank[1]) | (~balance_ok & ~blank[2])
+        debit = np.where(debit_ok, debit, 0)
+        credit = np.where(credit_ok, credit, 0)
+        # Saldo kosong atau tidak terbaca tidak bisa dicek, begitu juga baris sesudahnya
+        present = balance_ok.copy()
+
+        previous = np.empty(n, dtype=np.int64)
+        previous[1:] = balance[:-1]
+        previous[0] = self.last_balance or 0
+        has_previous = np.empty(n, dtype=bool)
+        has_previous[1:] = present[:-1]
+        has_previous[0] = self.last_balance is not None
+
+        expected = previous - debit + credit
+        checked = present & has_previous & ~unparsed
+        broken = np.flatnonzero(checked & (expected != balance))
+
+        if self.first is None:
+            self.first = (int(debit[0]), int(credit[0]), int(balance[0]) if present[0] else None)
+        self.checked += int(checked.sum())
+        self.breaks += len(broken)
+        unparsed_rows = np.flatnonzero(unparsed)
+        self.unparsed += len(unparsed_rows)
+        self.unparsed_rows += (unparsed_rows[:MAX_ISSUES - len(self.unparsed_rows)] + self.rows + 1).tolist()
+        for i in broken[:MAX_ISSUES - len(self.issues)].tolist():
+            difference = int(balance[i] - expected[i])
+            self.issues.append({
+                'row': self.rows + i + 1,
+                'date': records[i][date_i],
+                'description': records[i][desc_i],
+                'expected': int(expected[i]),
+                'balance': int(balance[i]),
+                'difference': difference,
+                # Selisih dua kali nominal: debit/kredit tertukar
+                'dbcr': difference != 0 and abs(difference) == 2 * abs(int(credit[i] - debit[i])),
+            })
+
+        self.total_debit += int(debit.sum())
+        self.total_credit += int(credit.sum())
+        self.last_balance = int(balance[-1]) if present[-1] else None
+        self.rows += n
+
+    def close(self, info_rows):
+        pass
+
+    def abort(self):
+        pass
+
+    def finish(self, info):
+        """
+        Cocokkan dengan saldo/total dari PDF; return dict hasil:
+        status 'ok', 'fail' atau 'skip' (tidak ada kolom saldo untuk dicek)
+        """
+        header = {name: info_cents(info.get(key)) for name, key in self.balance_info.items()}
+        computed = {'debit': self.total_debit, 'credit': self.total_credit, 'closing': self.last_balance}
+        if self.first is not None and self.first[2] is not None:
+            first_debit, first_credit, first_balance = self.first
+            # Saldo awal yang membuat baris pertama cocok
+            computed['opening'] = first_balance + first_debit - first_credit
+
+        mismatches = [
+            {'field': name, 'header': expected, 'computed': computed.get(name)}
+            for name, expected in header.items()
+            if expected is not None and computed.get(name) is not None and computed[name] != expected
+        ]
+        if self.indexes is None or not (self.checked or self.unparsed or any(v is not None for v in header.values())):
+            status = 'skip'
+        else:
+            status = 'fail' if self.breaks or mismatches or self.unparsed else 'ok'
+        return {
+            'status': status, 'rows': self.rows, 'checked': self.checked, 'breaks': self.breaks,
+            'issues': self.issues, 'header': mismatches, 'unparsed': self.unparsed, 'unparsed_rows': self.unparsed_rows,
+        }
+
+
+def summarize(report):
+    """Ringkasan satu baris untuk summary.csv, mis. 'fail: 2 baris (57, 120); saldo akhir'"""
+    if report['status'] != 'fail':
+        return report['status']
+    parts = []
+    if report['breaks']:
+        rows = ', '.join(str(issue['row']) for issue in report['issues'][:5])
+        more = f" +{report['breaks'] - 5}" if report['breaks'] > 5 else ''
+        parts.append(f"{report['breaks']} baris ({rows}{more})")
+    if report.get('unparsed'):
+        rows = ', '.join(str(row) for row in report['unparsed_rows'][:5])
+        more = f" +{report['unparsed'] - 5}" if report['unparsed'] > 5 else ''
+        parts.append(f"{report['unparsed']} nominal tidak terbaca ({rows}{more})")
+    parts += [HEADER_LABELS[item['field']] for item in report['header']]
+    return 'fail: ' + '; '.join(parts)
+
+
+def describe_issue(issue):
+    """Satu baris text untuk satu baris bermasalah"""
+    expected, balance, difference = format_cents([issue['expected'], issue['balance'], issue['difference']])
+    hint = ' (DB/CR tertukar?)' if issue['dbcr'] else ''
+    return (f"baris {issue['row']} {issue['date']} {issue['description'][:40]!r}: saldo {balance}, "
+            f"seharusnya {expected} (selisih {difference}){hint}")
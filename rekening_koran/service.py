@@ -0,0 +1,441 @@
+"""HTTP API kecil (asyncio, tanpa dependency) untuk konversi lewat job queue.
+
+    POST   /jobs?format=auto&outputs=xlsx,csv   body: isi PDF      → 202 {job}
+    GET    /jobs/{id}                                               → {job}
+    GET    /jobs/{id}/files/{jenis}   jenis: xlsx, csv, parquet ... → file output
+    DELETE /jobs/{id}                                               → hapus job dan filenya
+    GET    /health                                                  → status antrean
+    GET    /metrics                                                 → teks Prometheus (serve --metrics)
+
+Nama file bisa dikirim lewat header X-Filename atau query ``name``.
+Setiap job dikonversi di prosesnya sendiri, bukan di event loop. Antrean
+dibatasi ``queue_size`` (penuh → 503), jumlah job yang jalan bersamaan sama
+dengan jumlah worker, dan setiap job dibatasi ``timeout`` detik sejak mulai
+dikonversi; proses yang melewati timeout dibunuh sehingga slotnya langsung
+dipakai job berikutnya. Proses yang mati (mis. kehabisan memori) hanya
+menggagalkan job-nya sendiri.
+
+Job yang sudah selesai beserta filenya dihapus otomatis setelah ``ttl``
+detik, begitu juga folder job sisa run sebelumnya.
+
+``LocalClient`` memanggil router yang sama tanpa socket, untuk pemakaian
+dan pengujian dalam satu proses.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import time
+import uuid
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import ignore_sigint
+from .cache import DEFAULT_MAX_BYTES
+from .convert import convert_file
+from .detect import AUTO
+from .formats import PARSERS
+from .metrics import PrometheusMetrics
+from .sinks import DEFAULT_OUTPUTS, SINKS
+
+# Batas ukuran PDF yang diterima (byte)
+DEFAULT_MAX_UPLOAD = 100 * 2**20
+
+# Umur job yang sudah selesai sebelum dihapus (detik)
+DEFAULT_TTL = 24 * 3600
+# Selang pengecekan job kedaluwarsa paling lama (detik)
+EXPIRE_INTERVAL = 60
+
+CONTENT_TYPES = {
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.csv': 'text/csv; charset=utf-8',
+    '.parquet': 'application/vnd.apache.parquet',
+    '.arrow': 'application/vnd.apache.arrow.file',
+    '.sqlite': 'application/vnd.sqlite3',
+}
+
+REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+_SAFE_NAME = re.compile(r'[^\w.\- ]+')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def json_response(status, data):
+    return status, {'Content-Type': 'application/json'}, json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def write_file(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def run_job(conn, args):
+    """Isi proses job: convert_file(*args), hasilnya dikirim lewat pipe"""
+    ignore_sigint()
+    try:
+        conn.send(convert_file(*args))
+    finally:
+        conn.close()
+
+
+def job_context():
+    """
+    Context multiprocessing untuk proses job
+    forkserver: proses baru cepat (modul konversi sudah di-import) dan aman
+    walaupun event loop sudah punya thread; spawn jika tidak tersedia
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([convert_file.__module__])
+    return context
+
+
+class JobService:
+    """
+    Job konversi: PDF disimpan di work_dir/ID, dikonversi di proses sendiri,
+    hasilnya disimpan di folder yang sama sampai job dihapus atau kedaluwarsa
+    ttl: umur job selesai (detik) sebelum dihapus otomatis; None = tidak pernah
+    """
+
+    def __init__(self, work_dir, workers=None, queue_size=100, timeout=300, max_upload=DEFAULT_MAX_UPLOAD,
+                 cache_dir=None, metrics=False, ttl=DEFAULT_TTL):
+        self.work_dir = work_dir
+        self.workers = workers or os.cpu_count()
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_upload = max_upload
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        # Waktu per tahap semua job yang selesai, untuk GET /metrics
+        self.metrics = PrometheusMetrics() if metrics else None
+        self.jobs = {}
+        # job id -> {jenis: path file output}
+        self.paths = {}
+        self.queue = None
+        self.context = None
+        self.runners = []
+
+    async def start(self):
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.context = job_context()
+        self.runners = [asyncio.create_task(self.run_jobs()) for _ in range(self.workers)]
+        if self.ttl is not None:
+            self.runners.append(asyncio.create_task(self.expire_jobs()))
+
+    async def stop(self):
+        # Proses job yang masih jalan dibunuh oleh runner-nya
+        for runner in self.runners:
+            runner.cancel()
+        await asyncio.gather(*self.runners, return_exceptions=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ============================================================
+    # JOB
+    # ============================================================
+    async def submit(self, pdf_bytes, name='statement.pdf', format_name=AUTO, outputs=DEFAULT_OUTPUTS):
+        """Simpan PDF dan masukkan ke antrean; HTTPError 503 jika antrean penuh"""
+        if format_name != AUTO and format_name not in PARSERS:
+            raise HTTPError(400, f"Format tidak dikenal: {format_name}")
+        unknown = [output for output in outputs if output not in SINKS]
+        if unknown or not outputs:
+            raise HTTPError(400, f"Output tidak dikenal: {', '.join(unknown) or '(kosong)'}")
+        if not pdf_bytes:
+            raise HTTPError(400, 'Body kosong, kirim isi PDF')
+        if self.queue.full():
+            raise HTTPError(503, 'Antrean penuh, coba lagi nanti')
+
+        name = _SAFE_NAME.sub('_', os.path.basename(name)).strip() or 'statement.pdf'
+        if not name.lower().endswith('.pdf'):
+            name += '.pdf'
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.work_dir, job_id)
+        os.makedirs(job_dir)
+        await asyncio.to_thread(write_file, os.path.join(job_dir, name), pdf_bytes)
+        if self.queue.full():
+            # Antrean penuh selama PDF ditulis
+            await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
+            raise HTTPError(503, 'Antrean penuh, coba lagi nanti')
+
+        job = self.jobs[job_id] = {
+            'id': job_id, 'status': 'queued', 'file': name, 'format': format_name, 'outputs': list(outputs),
+            'submitted': time.time(), 'started': None, 'finished': None, 'result': None, 'files': [],
+        }
+        self.queue.put_nowait(job_id)
+        return job
+
+    async def convert(self, args):
+        """
+        convert_file(*args) di proses baru; proses dibunuh jika melewati timeout
+        Return: dict hasil; asyncio.TimeoutError atau RuntimeError (proses mati)
+        """
+        loop = asyncio.get_running_loop()
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=run_job, args=(sender, args))
+        process.start()
+        sender.close()
+        ready = asyncio.Event()
+        loop.add_reader(receiver.fileno(), ready.set)
+        try:
+            # Pipe terbaca saat hasil dikirim atau saat proses mati (EOF)
+            await asyncio.wait_for(ready.wait(), self.timeout)
+            try:
+                return await asyncio.to_thread(receiver.recv)
+            except EOFError:
+                await asyncio.to_thread(process.join)
+                raise RuntimeError(f"Proses konversi mati (exit code {process.exitcode})") from None
+        finally:
+            loop.remove_reader(receiver.fileno())
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            await asyncio.to_thread(process.join)
+
+    async def run_jobs(self):
+        """Ambil job dari antrean satu per satu; jumlah runner = batas job bersamaan"""
+        while True:
+            job_id = await self.queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job['status'] = 'running'
+                job['started'] = time.time()
+                job_dir = os.path.join(self.work_dir, job_id)
+                args = (os.path.join(job_dir, job['file']), job['format'], job_dir, None, job['outputs'],
+                        self.cache_dir, DEFAULT_MAX_BYTES, self.metrics is not None)
+                try:
+                    result = await self.convert(args)
+                except asyncio.TimeoutError:
+                    job['status'] = 'timeout'
+                    job['result'] = {'error': f"Melebihi batas waktu {self.timeout}s"}
+                except Exception as e:
+                    # Proses mati (mis. kehabisan memori)
+                    job['status'] = 'error'
+                    job['result'] = {'error': f"{type(e).__name__}: {e}"}
+                else:
+                    job['status'] = result['status']
+                    job['result'] = result
+                    if self.metrics is not None:
+                        self.metrics.add(result)
+                    paths = self.paths[job_id] = {
+                        os.path.splitext(path)[1].lstrip('.'): path for path in filter(None, result['outputs'].split(';'))
+                    }
+                    job['files'] = list(paths)
+                job['finished'] = time.time()
+            finally:
+                self.queue.task_done()
+
+    def job(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPError(404, f"Job tidak ditemukan: {job_id}")
+        return job
+
+    def output_path(self, job_id, kind):
+        """Path file output jenis kind (xlsx, csv, ...) dari job yang sudah selesai"""
+        job = self.job(job_id)
+        if kind not in job['files']:
+            raise HTTPError(404, f"Output {kind} tidak ada untuk job {job_id} (status {job['status']})")
+        return self.paths[job_id][kind]
+
+    async def delete(self, job_id):
+        job = self.job(job_id)
+        if job['status'] in ('queued', 'running'):
+            raise HTTPError(400, f"Job masih {job['status']}")
+        del self.jobs[job_id]
+        self.paths.pop(job_id, None)
+        await asyncio.to_thread(shutil.rmtree, os.path.join(self.work_dir, job_id), ignore_errors=True)
+
+    async def expire_jobs(self):
+        """Hapus job yang selesai lebih dari ttl detik lalu, dan folder job tanpa job (sisa run sebelumnya)"""
+        while True:
+            cutoff = time.time() - self.ttl
+            for job_id, job in list(self.jobs.items()):
+                # Job bisa sudah dihapus lewat DELETE selama menunggu penghapusan sebelumnya
+                if job['finished'] is not None and job['finished'] < cutoff and self.jobs.get(job_id) is job:
+                    await self.delete(job_id)
+            await asyncio.to_thread(self.remove_stale_dirs, cutoff)
+            await asyncio.sleep(min(self.ttl, EXPIRE_INTERVAL))
+
+    def remove_stale_dirs(self, cutoff):
+        for entry in os.scandir(self.work_dir):
+            if entry.is_dir() and entry.name not in self.jobs and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    # ============================================================
+    # ROUTER
+    # ============================================================
+    async def handle(self, method, target, headers, body):
+        """Proses satu request; return (status, headers, body bytes)"""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+
+        try:
+            if parts == ['health'] and method == 'GET':
+                counts = {}
+                for job in self.jobs.values():
+                    counts[job['status']] = counts.get(job['status'], 0) + 1
+                return json_response(200, {
+                    'queued': self.queue.qsize(), 'queue_size': self.queue_size, 'workers': self.workers,
+                    'jobs': counts,
+                })
+
+            if parts == ['metrics'] and method == 'GET':
+                if self.metrics is None:
+                    raise HTTPError(404, 'Metrics tidak aktif (jalankan serve --metrics)')
+                return 200, {'Content-Type': 'text/plain; version=0.0.4'}, self.metrics.render().encode('utf-8')
+
+            if parts == ['jobs'] and method == 'POST':
+                outputs = [o.strip() for o in query.get('outputs', ','.join(DEFAULT_OUTPUTS)).split(',') if o.strip()]
+                job = await self.submit(
+                    body, headers.get('x-filename') or query.get('name', 'statement.pdf'),
+                    query.get('format', AUTO), outputs,
+                )
+                return json_response(202, job)
+
+            if len(parts) == 2 and parts[0] == 'jobs':
+                if method == 'GET':
+                    return json_response(200, self.job(parts[1]))
+                if method == 'DELETE':
+                    await self.delete(parts[1])
+                    return json_response(200, {'id': parts[1], 'deleted': True})
+                raise HTTPError(405, f"Method {method} tidak didukung")
+
+            if len(parts) == 4 and parts[0] == 'jobs' and parts[2] == 'files' and method == 'GET':
+                path = self.output_path(parts[1], parts[3])
+                data = await asyncio.to_thread(read_file, path)
+                extension = os.path.splitext(path)[1]
+                return 200, {
+                    'Content-Type': CONTENT_TYPES.get(extension, 'application/octet-stream'),
+                    'Content-Disposition': f'attachment; filename="{os.path.basename(path)}"',
+                }, data
+
+            raise HTTPError(404, f"Tidak ada route {method} {url.path}")
+        except HTTPError as e:
+            return json_response(e.status, {'error': str(e)})
+
+
+# ============================================================
+# HTTP/1.1 MINIMAL
+# ============================================================
+async def read_request(reader, max_body):
+    """(method, target, headers, body) dari satu request; HTTPError untuk request yang ditolak"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, 'Request line tidak valid') from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+
+    body = b''
+    if method in ('POST', 'PUT'):
+        if 'content-length' not in headers:
+            raise HTTPError(411, 'Content-Length wajib diisi')
+        length = headers['content-length']
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(400, f"Content-Length tidak valid: {length!r}")
+        length = int(length)
+        if length > max_body:
+            raise HTTPError(413, f"PDF lebih dari {max_body // 2**20} MB")
+        body = await reader.readexactly(length)
+    return method.upper(), target, headers, body
+
+
+async def write_response(writer, status, headers, body):
+    head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    head += [f"{key}: {value}" for key, value in headers.items()]
+    head += [f"Content-Length: {len(body)}", 'Connection: close', '', '']
+    writer.write('\r\n'.join(head).encode('latin-1') + body)
+    await writer.drain()
+
+
+async def serve(service, host='127.0.0.1', port=8080, ready=None):
+    """Jalankan HTTP server sampai dibatalkan; ready(server) dipanggil setelah socket siap"""
+
+    async def on_connection(reader, writer):
+        try:
+            try:
+                request = await read_request(reader, service.max_upload)
+                if request is None:
+                    return
+                response = await service.handle(*request)
+            except HTTPError as e:
+                response = json_response(e.status, {'error': str(e)})
+            except Exception as e:
+                response = json_response(500, {'error': f"{type(e).__name__}: {e}"})
+            await write_response(writer, *response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(on_connection, host, port)
+    async with server:
+        if ready:
+            ready(server)
+        await server.serve_forever()
+
+
+class LocalClient:
+    """Klien dalam proses yang memanggil JobService.handle langsung (tanpa socket)"""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def request(self, method, path, body=b'', headers=None):
+        """Return (status, headers, body); JSON otomatis di-decode jika Content-Type JSON"""
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        status, response_headers, data = await self.service.handle(method, path, headers, body)
+        if response_headers.get('Content-Type') == 'application/json':
+            data = json.loads(data)
+        return status, response_headers, data
+
+    async def submit(self, pdf_path, format_name=AUTO, outputs=DEFAULT_OUTPUTS):
+        with open(pdf_path, 'rb') as f:
+            body = f.read()
+        return await self.request(
+            'POST', f"/jobs?format={format_name}&outputs={','.join(outputs)}", body,
+            {'X-Filename': os.path.basename(pdf_path)},
+        )
+
+    async def wait(self, job_id, poll=0.05):
+        """Tunggu sampai job selesai; return dict job"""
+        while True:
+            _, _, job = await self.request('GET', f"/jobs/{job_id}")
+            if job['status'] not in ('queued', 'running'):
+                return job
+            await asyncio.sleep(poll)
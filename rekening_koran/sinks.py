@@ -0,0 +1,463 @@
+"""Sink output yang menulis record transaksi secara bertahap.
+
+Setiap sink punya method yang sama:
+
+- ``write_rows(records)``: tulis satu batch record (biasanya satu halaman)
+- ``close(info_rows)``: tulis info rekening dan tutup file
+- ``abort()``: tutup dan hapus file yang belum selesai
+
+Sink dengan ``shared = True`` menulis semua PDF ke satu file di folder output
+dan menerima path PDF sebagai argumen ketiga.
+"""
+
+import csv
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from .cache import file_hash
+from .common import column_amounts
+
+
+class CsvSink:
+    """CSV utf-8-sig seperti df.to_csv() di script Colab"""
+
+    extension = '.csv'
+
+    def __init__(self, path, parser):
+        self.path = path
+        self.file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file, lineterminator='\n')
+        self.writer.writerow(parser.OUTPUT_COLUMNS)
+
+    def write_rows(self, records):
+        self.writer.writerows(records)
+
+    def close(self, info_rows):
+        self.file.close()
+
+    def abort(self):
+        self.file.close()
+        os.remove(self.path)
+
+
+# Lebar kolom maksimum saat lebar dihitung otomatis (sama dengan script BCA)
+MAX_COLUMN_WIDTH = 50
+
+
+def update_widths(widths, rows):
+    """Perbarui panjang isi terpanjang per kolom dengan baris-baris baru"""
+    for row in rows:
+        for i, value in enumerate(row):
+            if value is not None:
+                length = len(str(value))
+                if length > widths[i]:
+                    widths[i] = length
+
+
+def set_column_widths(sheet, widths):
+    """Terapkan lebar kolom; harus sebelum baris pertama di sheet write-only"""
+    for i, width in enumerate(widths, 1):
+        sheet.column_dimensions[get_column_letter(i)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+
+class XlsxSink:
+    """
+    XLSX dengan openpyxl write-only; baris langsung dialirkan ke file sementara
+
+    Untuk format dengan AUTO_WIDTH, lebar kolom dihitung dari baris yang lewat.
+    Sheet write-only menulis lebar kolom sebelum baris pertama, jadi batch
+    disimpan dulu ke file sementara (pickle) lalu diputar ulang saat close();
+    memori tetap sebesar satu batch.
+    """
+
+    extension = '.xlsx'
+
+    def __init__(self, path, parser):
+        self.path = path
+        self.columns = parser.OUTPUT_COLUMNS
+        self.info_header = parser.INFO_HEADER
+        self.auto_width = parser.AUTO_WIDTH
+        self.workbook = Workbook(write_only=True)
+        # Sheet info dibuat duluan supaya urutan sheet sama dengan script Colab,
+        # isinya ditulis saat close() karena total baru diketahui di akhir
+        self.info_sheet = self.workbook.create_sheet(parser.INFO_SHEET)
+        self.data_sheet = self.workbook.create_sheet(parser.DATA_SHEET)
+
+        if self.auto_width:
+            self.widths = [len(name) for name in self.columns]
+            self.spill = tempfile.TemporaryFile()
+        else:
+            self.spill = None
+            self.data_sheet.append(self.columns)
+
+    def write_rows(self, records):
+        if self.spill is None:
+            for record in records:
+                self.data_sheet.append(record)
+            return
+
+        update_widths(self.widths, records)
+        pickle.dump([tuple(record) for record in records], self.spill, pickle.HIGHEST_PROTOCOL)
+
+    def close(self, info_rows):
+        info_rows = [self.info_header] + list(info_rows) if self.info_header else list(info_rows)
+
+        if self.auto_width:
+            info_widths = [0] * max((len(row) for row in info_rows), default=0)
+            update_widths(info_widths, info_rows)
+            set_column_widths(self.info_sheet, info_widths)
+        for row in info_rows:
+            self.info_sheet.append(row)
+
+        if self.spill is not None:
+            set_column_widths(self.data_sheet, self.widths)
+            self.data_sheet.append(self.columns)
+            self.spill.seek(0)
+            while True:
+                try:
+                    batch = pickle.load(self.spill)
+                except EOFError:
+                    break
+                for record in batch:
+                    self.data_sheet.append(record)
+            self.spill.close()
+
+        self.workbook.save(self.path)
+
+    def abort(self):
+        if self.spill is not None:
+            self.spill.close()
+        self.workbook.close()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        raise ImportError("Output parquet/arrow butuh pyarrow: pip install pyarrow") from None
+    return pa, pc
+
+
+class ArrowBatches:
+    """
+    Ubah record (text yang sudah diformat) menjadi RecordBatch bertipe
+    Tipe kolom dari parser.COLUMN_TYPES: 'int', 'decimal' (decimal128 dengan
+    2 desimal), ('timestamp', formats) atau ('date', formats) dengan formats
+    strptime yang dicoba berurutan; kolom lain string. Nilai decimal diambil
+    dari sen hasil finalize_rows (Records.amounts). Text kosong dan nilai yang
+    tidak bisa dibaca (nominal, angka atau tanggal) menjadi null
+    """
+
+    DECIMAL_PRECISION = 19
+
+    def __init__(self, parser):
+        self.pa, self.pc = _import_pyarrow()
+        pa = self.pa
+        self.columns = parser.OUTPUT_COLUMNS
+        column_types = getattr(parser, 'COLUMN_TYPES', {})
+        self.kinds = [column_types.get(name, 'string') for name in self.columns]
+        self.decimal = pa.decimal128(self.DECIMAL_PRECISION, 2)
+
+        fields = []
+        for name, kind in zip(self.columns, self.kinds):
+            kind = kind[0] if isinstance(kind, tuple) else kind
+            fields.append((name, {
+                'int': pa.int64(),
+                'decimal': self.decimal,
+                'timestamp': pa.timestamp('ms'),
+                'date': pa.date32(),
+            }.get(kind, pa.string())))
+        self.schema = pa.schema(fields)
+
+    def batch(self, records):
+        columns = list(zip(*records))
+        arrays = [
+            self.decimal_array(*column_amounts(records, i, name)) if kind == 'decimal' else self.array(values, kind)
+            for i, (name, values, kind) in enumerate(zip(self.columns, columns, self.kinds))
+        ]
+        return self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def decimal_array(self, cents, valid):
+        """Sen exact (int64) menjadi decimal128 2 desimal; valid False menjadi null"""
+        pa = self.pa
+        unscaled = pa.array(cents, type=pa.int64(), mask=~valid).cast(pa.decimal128(self.DECIMAL_PRECISION, 0))
+        return unscaled.view(self.decimal)
+
+    def array(self, values, kind):
+        pa, pc = self.pa, self.pc
+        texts = [None if v is None or v == '' else str(v) for v in values]
+
+        if kind == 'int':
+            return pa.array([int(t) if t is not None and t.strip().isdecimal() else None for t in texts],
+                            type=pa.int64())
+
+        if isinstance(kind, tuple):
+            unit, formats = kind
+            strings = pa.array(texts, type=pa.string())
+            # Format pertama yang cocok dipakai (%y ditulis sebelum %Y supaya 25 tidak menjadi tahun 0025)
+            parsed = pc.coalesce(*[
+                pc.strptime(strings, format=fmt, unit='ms', error_is_null=True) for fmt in formats
+            ])
+            return parsed.cast(pa.date32()) if unit == 'date' else parsed
+
+        return pa.array(texts, type=pa.string())
+
+
+class ParquetSink:
+    """
+    Parquet bertipe (butuh pyarrow); satu row group setiap ROW_GROUP_SIZE baris
+    Info rekening disimpan di metadata file dengan kunci INFO_METADATA (JSON)
+    """
+
+    extension = '.parquet'
+    ROW_GROUP_SIZE = 65536
+    INFO_METADATA = 'rekening_koran.info'
+
+    def __init__(self, path, parser):
+        self.batches = ArrowBatches(parser)
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.writer = pq.ParquetWriter(path, self.batches.schema)
+        # RecordBatch per halaman; ditulis sebagai satu row group saat cukup
+        self.buffer = []
+        self.buffered = 0
+
+    def write_rows(self, records):
+        if not records:
+            return
+        self.buffer.append(self.batches.batch(records))
+        self.buffered += len(records)
+        if self.buffered >= self.ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        table = self.batches.pa.Table.from_batches(self.buffer, schema=self.batches.schema)
+        self.writer.write_table(table, row_group_size=self.buffered)
+        self.buffer = []
+        self.buffered = 0
+
+    def close(self, info_rows):
+        self.flush()
+        self.writer.add_key_value_metadata({
+            self.INFO_METADATA: json.dumps([list(row) for row in info_rows], ensure_ascii=False),
+        })
+        self.writer.close()
+
+    def abort(self):
+        self.writer.close()
+        os.remove(self.path)
+
+
+class ArrowSink:
+    """Arrow IPC file (.arrow, dibaca dengan pyarrow.ipc atau Feather) dengan kolom bertipe"""
+
+    extension = '.arrow'
+
+    def __init__(self, path, parser):
+        self.batches = ArrowBatches(parser)
+        self.path = path
+        self.sink = self.batches.pa.OSFile(path, 'wb')
+        self.writer = self.batches.pa.ipc.new_file(self.sink, self.batches.schema)
+
+    def write_rows(self, records):
+        if records:
+            self.writer.write_batch(self.batches.batch(records))
+
+    def close(self, info_rows):
+        self.writer.close()
+        self.sink.close()
+
+    def abort(self):
+        self.writer.close()
+        self.sink.close()
+        os.remove(self.path)
+
+
+# Skema database gabungan; jumlah uang disimpan dalam sen (INTEGER) supaya exact
+DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    id INTEGER PRIMARY KEY,
+    file_hash TEXT NOT NULL UNIQUE,
+    file TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    account TEXT NOT NULL,
+    info TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    loaded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS statements_account ON statements (account);
+CREATE TABLE IF NOT EXISTS transactions (
+    statement_id INTEGER NOT NULL REFERENCES statements (id),
+    seq INTEGER NOT NULL,
+    account TEXT NOT NULL,
+    date TEXT,
+    description TEXT NOT NULL,
+    debit INTEGER,
+    credit INTEGER,
+    balance INTEGER,
+    record TEXT NOT NULL,
+    PRIMARY KEY (statement_id, seq)
+);
+CREATE INDEX IF NOT EXISTS transactions_account_date ON transactions (account, date);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date);
+"""
+
+
+def iso_dates(values, formats):
+    """Text tanggal ke ISO 8601 (urut sebagai text); kosong atau tidak dikenali menjadi None"""
+    out = []
+    last = formats[0] if formats else None
+    for value in values:
+        parsed = None
+        if value:
+            # Format yang terakhir cocok dicoba duluan; satu dokumen biasanya satu format
+            for fmt in [last] + [f for f in formats if f != last]:
+                try:
+                    parsed = datetime.strptime(value, fmt)
+                except ValueError:
+                    continue
+                last = fmt
+                break
+        out.append(parsed.isoformat(sep=' ') if parsed else None)
+    return out
+
+
+class SqliteSink:
+    """
+    Semua statement di satu database SQLite (output_dir/DB_FILE)
+
+    Satu baris di statements per PDF (kunci: SHA-256 isi file) dan satu baris
+    di transactions per record, dengan index (account, date). Konversi ulang
+    file yang sama mengganti statement lamanya, jadi aman dijalankan berkali-kali.
+    Batch disimpan dulu ke file sementara lalu dimasukkan sekaligus dengan
+    executemany dalam satu transaksi saat close(), supaya worker lain tidak
+    menunggu lock selama PDF masih di-parse.
+    """
+
+    extension = '.sqlite'
+    DB_FILE = 'rekening_koran.sqlite'
+    shared = True
+
+    def __init__(self, path, parser, pdf_path):
+        self.path = path
+        self.parser = parser
+        self.pdf_path = pdf_path
+        date_col, desc_col, debit_col, credit_col, balance_col = parser.DB_COLUMNS
+        index = parser.OUTPUT_COLUMNS.index
+        self.indexes = [index(date_col), index(desc_col), index(debit_col), index(credit_col), index(balance_col)]
+        date_type = getattr(parser, 'COLUMN_TYPES', {}).get(date_col)
+        self.date_formats = list(date_type[1]) if isinstance(date_type, tuple) else []
+        self.rows = 0
+        self.spill = tempfile.TemporaryFile()
+
+    def write_rows(self, records):
+        if not records:
+            return
+        date_i, desc_i = self.indexes[:2]
+        n = len(records)
+        dates = iso_dates([record[date_i] for record in records], self.date_formats)
+        # Sen dari finalize_rows; kosong atau tidak terbaca disimpan NULL, bukan 0
+        amounts = []
+        for index, name in zip(self.indexes[2:], self.parser.DB_COLUMNS[2:]):
+            cents, valid = column_amounts(records, index, name)
+            amounts.append([int(c) if ok else None for c, ok in zip(cents.tolist(), valid.tolist())])
+        debit, credit, balance = amounts
+
+        rows = [
+            (self.rows + i, dates[i], record[desc_i], debit[i], credit[i], balance[i],
+             json.dumps(list(record), ensure_ascii=False))
+            for i, record in enumerate(records)
+        ]
+        self.rows += n
+        pickle.dump(rows, self.spill, pickle.HIGHEST_PROTOCOL)
+
+    def close(self, info_rows):
+        info_rows = [list(row) for row in info_rows]
+        account = ''
+        if self.parser.ACCOUNT_INFO:
+            account = next((str(row[1]) for row in info_rows if row and row[0] == self.parser.ACCOUNT_INFO), '')
+
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(DB_SCHEMA)
+            digest = file_hash(self.pdf_path)
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.execute(
+                    'DELETE FROM transactions WHERE statement_id IN (SELECT id FROM statements WHERE file_hash = ?)',
+                    (digest,),
+                )
+                db.execute('DELETE FROM statements WHERE file_hash = ?', (digest,))
+                statement_id = db.execute(
+                    'INSERT INTO statements (file_hash, file, parser, account, info, rows, loaded_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (digest, self.pdf_path, self.parser.NAME, account,
+                     json.dumps(info_rows, ensure_ascii=False), self.rows, time.time()),
+                ).lastrowid
+
+                self.spill.seek(0)
+                while True:
+                    try:
+                        batch = pickle.load(self.spill)
+                    except EOFError:
+                        break
+                    db.executemany(
+                        'INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        [(statement_id, row[0], account) + row[1:] for row in batch],
+                    )
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        finally:
+            db.close()
+            self.spill.close()
+
+    def abort(self):
+        self.spill.close()
+
+
+SINKS = {
+    'xlsx': XlsxSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+    'arrow': ArrowSink,
+    'sqlite': SqliteSink,
+}
+
+DEFAULT_OUTPUTS = ('xlsx', 'csv')
+
+
+def open_sinks(pdf_path, parser, output_dir, outputs=DEFAULT_OUTPUTS, stem=None):
+    """
+    Buka satu sink untuk setiap jenis output
+    stem: nama file output tanpa ekstensi (default: nama PDF)
+    """
+    stem = stem or os.path.splitext(os.path.basename(pdf_path))[0]
+    sinks = []
+    try:
+        for name in outputs:
+            sink_class = SINKS[name]
+            if getattr(sink_class, 'shared', False):
+                # Satu file untuk semua PDF di output_dir
+                sinks.append(sink_class(os.path.join(output_dir, sink_class.DB_FILE), parser, pdf_path))
+            else:
+                sinks.append(sink_class(os.path.join(output_dir, stem + sink_class.extension), parser))
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    return sinks
@@ -0,0 +1,121 @@
+"""Alur streaming: PDF → record transaksi per halaman → sink.
+
+Tidak ada DataFrame atau list seluruh dokumen; memori puncak sebanding
+dengan satu halaman (ditambah hash baris untuk buang duplikat).
+"""
+
+import hashlib
+
+import pandas as pd
+
+from .extract import iter_keyed_page_rows
+from .metrics import add_rows, stage
+
+
+def is_empty_row(row):
+    """Baris tanpa isi sama sekali (setara dropna(how='all'))"""
+    return all(value is None or value == '' for value in row)
+
+
+def row_key(row):
+    """Hash 16 byte untuk identitas baris; jauh lebih kecil dari menyimpan barisnya"""
+    return hashlib.blake2b('\x1f'.join(map(str, row)).encode('utf-8'), digest_size=16).digest()
+
+
+def clean_rows(rows, seen=None):
+    """
+    Buang baris kosong dari baris satu halaman; jika seen (set hash lintas
+    halaman) diberikan, buang juga duplikat
+    Identitas baris = isi + posisinya dari tepi halaman terdekat (baris ke-i
+    dari atas, atau dari bawah untuk paruh bawah halaman). Header/footer yang
+    berulang dan halaman yang tercetak dua kali ada di posisi yang sama, jadi
+    dibuang; baris kembar di halaman yang sama atau transaksi yang sama persis
+    di posisi lain pada halaman berikutnya tetap disimpan.
+    """
+    rows = [row for row in rows if not is_empty_row(row)]
+    if seen is None:
+        return rows
+    n = len(rows)
+    unique_rows = []
+    for i, row in enumerate(rows):
+        # Paruh atas: 0, 1, 2 ...; paruh bawah: -1 (baris terakhir), -2 ...
+        position = i if 2 * i < n else i - n
+        key = row_key(row) + position.to_bytes(4, 'little', signed=True)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_rows.append(row)
+    return unique_rows
+
+
+def iter_batches(pdf_path, parser, info, page_workers=None, cache=None):
+    """
+    Generator (nomor_halaman, records) untuk setiap halaman
+    Baris kosong dibuang; duplikat dari halaman sebelumnya juga dibuang jika
+    parser.DEDUPLICATE (lihat clean_rows)
+    cache: RowCache opsional; PDF yang sudah pernah di-parse tidak dibuka lagi
+    """
+    seen = set() if parser.DEDUPLICATE else None
+    if cache is not None:
+        pages = cache.iter_page_rows(pdf_path, parser, info, page_workers)
+    else:
+        pages = ((page_num, rows) for page_num, _, rows in iter_keyed_page_rows(pdf_path, parser, info, page_workers))
+
+    for page_num, rows in pages:
+        with stage('clean', page_num):
+            rows = clean_rows(rows, seen)
+        with stage('format', page_num):
+            records = parser.finalize_rows(rows, info)
+        add_rows(page_num, len(records))
+        yield page_num, records
+
+
+def iter_transactions(pdf_path, parser, info, page_workers=None, cache=None):
+    """Generator record transaksi satu per satu"""
+    for _, records in iter_batches(pdf_path, parser, info, page_workers, cache):
+        yield from records
+
+
+def write_statement(pdf_path, parser, open_sinks, page_workers=None, cache=None):
+    """
+    Alirkan semua record ke sink; sink baru dibuka saat ada record pertama
+    open_sinks: fungsi tanpa argumen yang mengembalikan list sink
+    Return: (info, total_rows, total_pages); total_rows 0 berarti tidak ada sink yang ditulis
+    """
+    info = {}
+    sinks = None
+    total_rows = 0
+    total_pages = 0
+
+    try:
+        for total_pages, records in iter_batches(pdf_path, parser, info, page_workers, cache):
+            if not records:
+                continue
+            with stage('write', total_pages):
+                if sinks is None:
+                    sinks = open_sinks()
+                for sink in sinks:
+                    sink.write_rows(records)
+            total_rows += len(records)
+
+        if sinks:
+            parser.finish_info(info, total_rows)
+            info_rows = parser.info_rows(info, total_rows)
+            with stage('write'):
+                for sink in sinks:
+                    sink.close(info_rows)
+    except BaseException:
+        for sink in sinks or []:
+            sink.abort()
+        raise
+
+    return info, total_rows, total_pages
+
+
+def read_statement(pdf_path, parser, page_workers=None, cache=None):
+    """Baca satu PDF menjadi (info, DataFrame) untuk dipakai interaktif"""
+    info = {}
+    records = list(iter_transactions(pdf_path, parser, info, page_workers, cache))
+    df = pd.DataFrame(records, columns=parser.OUTPUT_COLUMNS)
+    parser.finish_info(info, len(df))
+    return info, df
@@ -0,0 +1,272 @@
+"""Pantau folder inbox dan konversi PDF segera setelah file selesai masuk.
+
+Folder di-scan berkala (polling); cara ini juga jalan di folder SFTP/NFS
+tempat notifikasi inotify sering tidak sampai. File baru dianggap selesai
+ditulis jika ukuran dan mtime-nya tidak berubah selama ``settle`` detik.
+
+Konversi dijalankan di process pool. Jumlah file yang sedang dikonversi
+dibatasi ``max_running``; file lain menunggu di antrean (urut kedatangan)
+dan baru dikirim ke pool jika ada slot kosong, jadi lonjakan kiriman tidak
+menumpuk di memori worker. Setelah selesai, PDF dipindah ke
+``INBOX/processed`` atau ``INBOX/failed`` dan hasilnya ditambahkan ke
+summary.csv di folder output (kolom archived: lokasi PDF setelah dipindah).
+
+Nama file sering dipakai ulang (mis. statement.pdf setiap bulan lewat SFTP).
+Jika PDF arsip atau output dengan nama itu sudah ada, PDF dan output-nya
+diberi akhiran waktu mulai konversi, jadi arsip bulan lalu tidak tertimpa.
+
+Jika satu worker mati (mis. dibunuh OOM killer), pool dibuat ulang. File
+yang sedang dikonversi saat itu diantrekan lagi; file yang ikut membuat
+pool rusak lebih dari ``POOL_RETRIES`` kali dicatat gagal.
+"""
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .batch import SUMMARY_FIELDS, find_pdfs, ignore_sigint
+from .cache import DEFAULT_MAX_BYTES
+from .convert import convert_file
+from .sinks import DEFAULT_OUTPUTS, SINKS
+
+PROCESSED_DIR = 'processed'
+FAILED_DIR = 'failed'
+
+# Berapa kali file diantrekan ulang setelah worker mati saat mengonversinya
+POOL_RETRIES = 1
+
+
+def file_state(path):
+    """(ukuran, mtime) file, atau None jika file sudah hilang"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def append_summary(result, summary_path):
+    """
+    Tambahkan satu hasil ke summary.csv; header ditulis jika file belum ada
+    File lama tetap memakai kolom di header-nya sendiri
+    """
+    is_new = not os.path.exists(summary_path)
+    fieldnames = SUMMARY_FIELDS
+    if not is_new:
+        with open(summary_path, newline='', encoding='utf-8-sig') as f:
+            fieldnames = next(csv.reader(f), None) or SUMMARY_FIELDS
+    with open(summary_path, 'a', newline='', encoding='utf-8-sig' if is_new else 'utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval='', extrasaction='ignore')
+        if is_new:
+            writer.writeheader()
+        writer.writerow(result)
+
+
+def move_to(pdf_path, folder, stem):
+    """Pindahkan PDF ke sub-folder inbox sebagai stem + ekstensi; return path baru atau None jika gagal"""
+    target_dir = os.path.join(os.path.dirname(pdf_path), folder)
+    try:
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, stem + os.path.splitext(pdf_path)[1])
+        os.replace(pdf_path, target)
+    except OSError:
+        return None
+    return target
+
+
+def unique_stem(pdf_path, output_dir, outputs):
+    """
+    Nama PDF arsip dan file output (tanpa ekstensi) yang belum dipakai: nama PDF,
+    atau nama PDF + waktu sekarang jika processed/, failed/ atau output_dir
+    sudah berisi file dengan nama itu
+    """
+    stem, extension = os.path.splitext(os.path.basename(pdf_path))
+    inbox_dir = os.path.dirname(pdf_path)
+    paths = [os.path.join(inbox_dir, folder, '{}' + extension) for folder in (PROCESSED_DIR, FAILED_DIR)]
+    paths += [
+        os.path.join(output_dir, '{}' + SINKS[name].extension) for name in outputs
+        if not getattr(SINKS[name], 'shared', False)
+    ]
+
+    def taken(candidate):
+        return any(os.path.exists(path.format(candidate)) for path in paths)
+
+    if not taken(stem):
+        return stem
+    base = f"{stem}_{time.strftime('%Y%m%d-%H%M%S')}"
+    candidate = base
+    count = 1
+    while taken(candidate):
+        count += 1
+        candidate = f"{base}-{count}"
+    return candidate
+
+
+class Inbox:
+    """Status file di folder inbox: menunggu stabil, antre, atau sudah diproses"""
+
+    def __init__(self, inbox_dir, settle):
+        self.inbox_dir = inbox_dir
+        self.settle = settle
+        # path -> (state, waktu terakhir state berubah)
+        self.watching = {}
+        # path -> state saat diproses; file yang tidak bisa dipindah tidak dikonversi ulang
+        self.done = {}
+        self.queue = deque()
+        # File yang antre atau sedang dikonversi
+        self.queued = set()
+        # path -> berapa kali worker mati saat mengonversi file ini
+        self.broken = {}
+        # path -> nama output/arsip yang dipakai; tetap sama jika file dikonversi ulang
+        self.stems = {}
+
+    def scan(self, now):
+        """Cek isi folder; file yang sudah stabil masuk antrean"""
+        present = set()
+        for path in find_pdfs(self.inbox_dir):
+            if os.path.basename(path).startswith('.'):
+                continue
+            present.add(path)
+            state = file_state(path)
+            if state is None or path in self.queued or self.done.get(path) == state:
+                continue
+
+            previous = self.watching.get(path)
+            if previous is None or previous[0] != state:
+                self.watching[path] = (state, now)
+            elif state[0] > 0 and now - previous[1] >= self.settle:
+                del self.watching[path]
+                self.done.pop(path, None)
+                self.queue.append(path)
+                self.queued.add(path)
+
+        # Lupakan file yang dihapus atau dipindah orang lain
+        for path in list(self.watching):
+            if path not in present:
+                del self.watching[path]
+        for path in list(self.done):
+            if path not in present:
+                del self.done[path]
+        for path in list(self.stems):
+            if path not in present and path not in self.queued:
+                del self.stems[path]
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def requeue(self, path):
+        """Kembalikan file ke depan antrean (pool rusak sebelum file selesai)"""
+        self.queue.appendleft(path)
+
+    def retry(self, path):
+        """Worker mati saat mengonversi path; True jika file masih boleh diantrekan ulang"""
+        self.broken[path] = self.broken.get(path, 0) + 1
+        return self.broken[path] <= POOL_RETRIES
+
+    def finish(self, path, state=None, moved=False):
+        """
+        Konversi selesai; state diisi jika file masih di inbox dan tidak boleh diproses ulang
+        moved: PDF sudah dipindah, namanya boleh dipakai file baru
+        """
+        self.queued.discard(path)
+        self.broken.pop(path, None)
+        if moved:
+            self.stems.pop(path, None)
+        if state is not None:
+            self.done[path] = state
+
+    def idle(self):
+        """Tidak ada file yang antre atau sedang ditunggu (file kosong diabaikan)"""
+        return not self.queue and all(state[0] == 0 for state, _ in self.watching.values())
+
+
+def watch_directory(inbox_dir, format_name, output_dir, workers=None, on_result=None, page_workers=None,
+                    outputs=DEFAULT_OUTPUTS, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES,
+                    settle=2.0, poll=1.0, max_running=None, once=False, should_stop=None, metrics=False,
+                    profile=None):
+    """
+    Konversi PDF yang masuk ke inbox_dir sampai dihentikan
+    max_running: batas file yang dikirim ke pool sekaligus (default: jumlah worker)
+    once: berhenti setelah inbox kosong dan semua konversi selesai
+    should_stop: fungsi tanpa argumen; True menghentikan loop setelah konversi berjalan selesai
+    metrics/profile: lihat convert_file; hasilnya di result['metrics'] untuk on_result
+    Return: jumlah file yang diproses
+    """
+    workers = workers or os.cpu_count()
+    max_running = max_running or workers
+    os.makedirs(output_dir, exist_ok=True)
+    summary_path = os.path.join(output_dir, 'summary.csv')
+    inbox = Inbox(inbox_dir, settle)
+    running = {}
+    processed = 0
+
+    def new_pool():
+        return ProcessPoolExecutor(max_workers=workers, initializer=ignore_sigint)
+
+    pool = new_pool()
+    try:
+        while True:
+            stopping = should_stop is not None and should_stop()
+            if not stopping:
+                inbox.scan(time.monotonic())
+                while inbox.queue and len(running) < max_running:
+                    pdf_path = inbox.pop()
+                    if pdf_path not in inbox.stems:
+                        inbox.stems[pdf_path] = unique_stem(pdf_path, output_dir, outputs)
+                    try:
+                        future = pool.submit(convert_file, pdf_path, format_name, output_dir, page_workers,
+                                             outputs, cache_dir, cache_bytes, metrics, profile,
+                                             stem=inbox.stems[pdf_path])
+                    except BrokenProcessPool:
+                        # Worker mati sebelum hasilnya terbaca; file ini belum mulai
+                        inbox.requeue(pdf_path)
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = new_pool()
+                        continue
+                    running[future] = (pdf_path, file_state(pdf_path), pool)
+
+            if not running:
+                if stopping or (once and inbox.idle()):
+                    break
+                time.sleep(poll)
+                continue
+
+            finished, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pdf_path, state, owner = running.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    # Worker mati (mis. kehabisan memori); semua file yang sedang jalan ikut gagal,
+                    # jadi diulang dulu di pool baru sebelum dicatat gagal
+                    if owner is pool:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = new_pool()
+                    if inbox.retry(pdf_path):
+                        inbox.requeue(pdf_path)
+                        continue
+                    result = {'file': pdf_path, 'format': format_name, 'status': 'error',
+                              'error': f"{type(e).__name__}: {e}"}
+                except Exception as e:
+                    result = {'file': pdf_path, 'format': format_name, 'status': 'error',
+                              'error': f"{type(e).__name__}: {e}"}
+
+                if file_state(pdf_path) != state:
+                    # File berubah selama dikonversi (upload belum selesai): tunggu stabil lalu ulangi
+                    inbox.finish(pdf_path)
+                    continue
+                moved = move_to(pdf_path, PROCESSED_DIR if result['status'] == 'ok' else FAILED_DIR,
+                                inbox.stems[pdf_path])
+                result['archived'] = moved or ''
+                inbox.finish(pdf_path, None if moved else state, moved=bool(moved))
+                append_summary(result, summary_path)
+                processed += 1
+                if on_result:
+                    on_result(result)
+    finally:
+        pool.shutdown()
+
+    return processed